@@ -0,0 +1,190 @@
+"""Локальный сервер задержек для воспроизводимых замеров задачи D.
+
+Повторяет эндпоинт /delay/{n} сервиса httpbin.org и дополнительно умеет
+добавлять разброс задержки, ошибки, медленную отдачу тела ответа и обрывы
+соединения. Сервер запускается в том же процессе, поэтому замеры не
+зависят от интернета.
+"""
+
+import asyncio
+import random
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+
+from aiohttp import web
+
+LOCALHOST = "127.0.0.1"
+MAX_DELAY = 10  # Как и httpbin, не ждём дольше 10 секунд
+BACKLOG = 4096
+
+
+@dataclass(frozen=True)
+class DelayServerConfig:
+    """Параметры поведения сервера задержек.
+
+    Attributes:
+        jitter: Максимальная случайная добавка к задержке в секундах.
+        error_rate: Доля ответов с кодом error_status.
+        error_status: Код ответа для ошибок.
+        drop_rate: Доля запросов, на которые сервер закрывает соединение
+            без ответа.
+        body_size: Размер тела ответа в байтах.
+        body_chunks: На сколько частей делится тело ответа.
+        body_chunk_delay: Пауза перед отправкой каждой части тела в секундах.
+        seed: Зерно генератора случайных чисел для воспроизводимости.
+    """
+
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    drop_rate: float = 0.0
+    body_size: int = 256
+    body_chunks: int = 1
+    body_chunk_delay: float = 0.0
+    seed: int | None = None
+
+
+CONFIG_KEY = web.AppKey("config", DelayServerConfig)
+RANDOM_KEY = web.AppKey("random", random.Random)
+
+
+async def delay_handler(request: web.Request) -> web.StreamResponse:
+    """Отвечает на /delay/{delay} после задержки в delay секунд.
+
+    Args:
+        request: HTTP-запрос.
+
+    Returns:
+        Ответ с телом из config.body_size байт.
+    """
+    config = request.app[CONFIG_KEY]
+    generator = request.app[RANDOM_KEY]
+    try:
+        delay = float(request.match_info["delay"])
+    except ValueError as error:
+        raise web.HTTPBadRequest(text="Delay must be a number.") from error
+    if config.jitter:
+        delay += generator.uniform(0, config.jitter)
+    await asyncio.sleep(min(max(delay, 0), MAX_DELAY))
+
+    if generator.random() < config.drop_rate:
+        # Обрываем соединение, клиент не получит ответа
+        if request.transport is not None:
+            request.transport.close()
+        return web.Response()
+    status = 200
+    if generator.random() < config.error_rate:
+        status = config.error_status
+
+    response = web.StreamResponse(status=status)
+    response.content_type = "application/octet-stream"
+    response.content_length = config.body_size
+    chunks = max(1, config.body_chunks)
+    chunk_size, remainder = divmod(config.body_size, chunks)
+    try:
+        await response.prepare(request)
+        for index in range(chunks):
+            if config.body_chunk_delay:
+                await asyncio.sleep(config.body_chunk_delay)
+            await response.write(b"x" * (chunk_size + (index < remainder)))
+        await response.write_eof()
+    except ConnectionResetError:
+        # Клиент закрыл соединение, не дождавшись ответа или не дочитав его
+        pass
+    return response
+
+
+def make_app(config: DelayServerConfig | None = None) -> web.Application:
+    """Создаёт приложение aiohttp сервера задержек.
+
+    Args:
+        config: Параметры поведения сервера.
+
+    Returns:
+        Приложение aiohttp.
+    """
+    config = config or DelayServerConfig()
+    app = web.Application()
+    app[CONFIG_KEY] = config
+    # Случайность нужна только для имитации сбоев.
+    app[RANDOM_KEY] = random.Random(config.seed)  # nosec B311
+    app.router.add_get("/delay/{delay}", delay_handler)
+    return app
+
+
+async def start_delay_server(
+    config: DelayServerConfig | None = None, host: str = LOCALHOST, port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Запускает сервер задержек в текущем цикле событий.
+
+    Args:
+        config: Параметры поведения сервера.
+        host: Адрес для прослушивания.
+        port: Порт. 0 - выбрать свободный порт.
+
+    Returns:
+        Пара (runner для остановки сервера, базовый URL сервера).
+    """
+    runner = web.AppRunner(make_app(config))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port, backlog=BACKLOG)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+@asynccontextmanager
+async def delay_server(
+    config: DelayServerConfig | None = None, host: str = LOCALHOST, port: int = 0
+) -> AsyncIterator[str]:
+    """Асинхронный контекстный менеджер сервера задержек.
+
+    Args:
+        config: Параметры поведения сервера.
+        host: Адрес для прослушивания.
+        port: Порт. 0 - выбрать свободный порт.
+
+    Yields:
+        Базовый URL сервера.
+    """
+    runner, url = await start_delay_server(config, host, port)
+    try:
+        yield url
+    finally:
+        await runner.cleanup()
+
+
+@contextmanager
+def delay_server_in_thread(
+    config: DelayServerConfig | None = None, host: str = LOCALHOST, port: int = 0
+) -> Iterator[str]:
+    """Запускает сервер задержек в отдельном потоке со своим циклом событий.
+
+    Так сервер не конкурирует с клиентом за один цикл событий, а клиент
+    может запускать свои замеры через asyncio.run.
+
+    Args:
+        config: Параметры поведения сервера.
+        host: Адрес для прослушивания.
+        port: Порт. 0 - выбрать свободный порт.
+
+    Yields:
+        Базовый URL сервера.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        runner, url = asyncio.run_coroutine_threadsafe(
+            start_delay_server(config, host, port), loop
+        ).result()
+        try:
+            yield url
+        finally:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
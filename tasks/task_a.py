@@ -9,12 +9,84 @@ https://github.com/miguelgrinberg/Flask-SocketIO.git).
 "вне формата".
 """
 
+import hashlib
+import math
+import os
 import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import IO
 
 from logger.logger import create_logger
 
 logger = create_logger(__name__)
 
+# Во время написания этого регулярного выражения пользовался
+# следующими правилами с сайта GitHub:
+# - Username may only contain alphanumeric characters or single hyphens,
+# and cannot begin or end with a hyphen.
+# - The repository name can only contain ASCII letters, digits, and the
+# characters ., -, and _.
+# Флаг re.ASCII ограничивает \w латиницей, а хвост ссылки (путь внутри
+# репозитория, query-строка или якорь) допускает только ASCII, поэтому
+# отдельная проверка на кириллицу не нужна: весь URL проверяется за один
+# проход.
+GITHUB_URL_REGEX = re.compile(
+    r"https://github\.com/([a-zA-Z\d](?:[a-zA-Z\d]|-(?=[a-zA-Z\d])){0,38})"
+    r"/([\w.-]+)(?:[/?#][\x00-\x7f]*)?\r?\n?",
+    re.ASCII,
+)
+# Та же регулярка для байтов: шарды файла проверяются без декодирования.
+GITHUB_URL_BYTES_REGEX = re.compile(GITHUB_URL_REGEX.pattern.encode(), re.ASCII)
+
+GITHUB_URL_PREFIX = "https://github.com/"
+CYRILLIC_REGEX = re.compile("[а-яА-ЯёЁ]")
+MAX_USERNAME_LENGTH = 39
+REJECTED_SAMPLE_LIMIT = 10
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+
+SHARD_SIZE = 64 * 1024 * 1024  # 64MB на один шард
+
+
+class RejectionReason(StrEnum):
+    """Причина, по которой URL не прошёл валидацию."""
+
+    NOT_GITHUB_URL = "not_github_url"
+    CYRILLIC = "cyrillic"
+    HYPHEN_AT_EDGE = "hyphen_at_edge"
+    DOUBLE_HYPHEN = "double_hyphen"
+    BAD_LENGTH = "bad_length"
+    FORBIDDEN_CHAR = "forbidden_char"
+
+
+@dataclass
+class UrlValidationReport:
+    """Результат пакетной валидации URL-адресов.
+
+    Attributes:
+        project_names: Названия проектов из валидных URL-адресов.
+        valid_count: Количество валидных URL-адресов.
+        rejection_counts: Количество отклонённых URL-адресов по причинам.
+        rejected_samples: Примеры отклонённых URL-адресов по причинам, не
+            больше sample_limit на причину.
+    """
+
+    project_names: set[str] = field(default_factory=set)
+    valid_count: int = 0
+    rejection_counts: Counter = field(default_factory=Counter)
+    rejected_samples: dict[RejectionReason, list[str]] = field(default_factory=dict)
+
+    @property
+    def rejected_count(self) -> int:
+        """Общее количество отклонённых URL-адресов."""
+        return self.rejection_counts.total()
+
 
 URLS = {
     "https://github.com/migue-lgr-inberg/Flask-SocketIO.git",
@@ -34,6 +106,9 @@ URLS = {
     "https://github.com/Siwencjusz/___",
     "https://github.com/nasser/--.git",
     "https://github.com/123456789012345678901234567890123456789/--.git",
+    # Query-строка и якорь не входят в название репозитория
+    "https://github.com/nasser/-#-",
+    "https://github.com/nasser/-?-",
     # Кириллица
     "https://github.com/taфytao/....git",
     "https://github.com/taytao/..ф...git",
@@ -75,14 +150,12 @@ URLS = {
     # Запрещённые символы в названии репозитория
     "https://github.com/nasser/-`-",
     "https://github.com/nasser/-@-",
-    "https://github.com/nasser/-#-",
     "https://github.com/nasser/-!-",
     "https://github.com/nasser/-%-",
     "https://github.com/nasser/-$-",
     "https://github.com/nasser/-;-",
     "https://github.com/nasser/-:-",
     "https://github.com/nasser/-№-",
-    "https://github.com/nasser/-?-",
     "https://github.com/nasser/-^-",
     "https://github.com/nasser/-&-",
     "https://github.com/nasser/-*-",
@@ -100,35 +173,461 @@ URLS = {
 }
 
 
+def _match_github_url(
+    url: str | bytes,
+    match_url: Callable = GITHUB_URL_REGEX.fullmatch,
+    suffix: str | bytes = ".git",
+) -> tuple[str, str] | tuple[bytes, bytes] | None:
+    """Разбирает URL GitHub на владельца и название проекта.
+
+    Суффикс ".git" отбрасывается без учёта регистра. Работает и со
+    строками, и с байтами: для байтов передаются GITHUB_URL_BYTES_REGEX и
+    суффикс b".git".
+
+    Args:
+        url: URL-адрес GitHub.
+        match_url: Метод fullmatch регулярного выражения URL.
+        suffix: Суффикс ".git" того же типа, что и url.
+
+    Returns:
+        Пара (владелец, название проекта) или None, если URL невалиден.
+    """
+    if (match := match_url(url)) is None:
+        return None
+    owner, project_name = match.groups()
+    if project_name[-4:].lower() == suffix:
+        project_name = project_name[:-4]
+    return owner, project_name
+
+
+def classify_github_url(url: str) -> RejectionReason | None:
+    """Определяет, почему URL не соответствует формату GitHub.
+
+    Args:
+        url: URL-адрес GitHub (допускается завершающий перевод строки).
+
+    Returns:
+        Причина отклонения или None, если URL валиден.
+    """
+    if GITHUB_URL_REGEX.fullmatch(url):
+        return None
+    url = url.rstrip("\r\n")
+    if CYRILLIC_REGEX.search(url):
+        return RejectionReason.CYRILLIC
+    if not url.startswith(GITHUB_URL_PREFIX):
+        return RejectionReason.NOT_GITHUB_URL
+    username, _, path = url[len(GITHUB_URL_PREFIX) :].partition("/")
+    repository = path.partition("/")[0]
+    if not username or len(username) > MAX_USERNAME_LENGTH or not repository:
+        return RejectionReason.BAD_LENGTH
+    if username[0] == "-" or username[-1] == "-":
+        return RejectionReason.HYPHEN_AT_EDGE
+    if "--" in username:
+        return RejectionReason.DOUBLE_HYPHEN
+    return RejectionReason.FORBIDDEN_CHAR
+
+
+def iter_url_rejections(
+    urls: Iterable[str],
+) -> Iterator[tuple[str, RejectionReason]]:
+    """Выдаёт отклонённые URL-адреса вместе с причиной отклонения.
+
+    Args:
+        urls: Итерируемый набор URL-адресов.
+
+    Yields:
+        Пары (URL, причина отклонения) для невалидных URL-адресов.
+    """
+    for url in urls:
+        if (reason := classify_github_url(url)) is not None:
+            yield url, reason
+
+
+def validate_github_urls(
+    urls: Iterable[str], sample_limit: int = REJECTED_SAMPLE_LIMIT
+) -> UrlValidationReport:
+    """Пакетно валидирует URL-адреса без логирования каждого из них.
+
+    Args:
+        urls: Итерируемый набор URL-адресов.
+        sample_limit: Максимум примеров отклонённых URL-адресов на одну
+            причину. 0 - не собирать примеры.
+
+    Returns:
+        Отчёт с названиями проектов и счётчиками причин отклонения.
+    """
+    report = UrlValidationReport()
+    project_names = report.project_names
+    for url in urls:
+        if (parts := _match_github_url(url)) is not None:
+            project_names.add(parts[1])
+            report.valid_count += 1
+            continue
+        reason = classify_github_url(url)
+        report.rejection_counts[reason] += 1
+        if sample_limit:
+            samples = report.rejected_samples.setdefault(reason, [])
+            if len(samples) < sample_limit:
+                samples.append(url.rstrip("\r\n"))
+    return report
+
+
 def extract_github_project_names(urls_set: set[str]):
     """Извлекает названия проектов из списка URL-адресов GitHub.
 
+    Невалидные URL-адреса не логируются по одному: после обработки всего
+    набора выводится одно предупреждение со счётчиками причин отклонения.
+
     Args:
         urls_set: Набор (set) URL-адресов GitHub.
 
     Returns:
         Набор (set) названий проектов, извлеченных из URL-адресов.
     """
+    report = validate_github_urls(urls_set)
+    if report.rejected_count:
+        reasons = ", ".join(
+            f"{reason}: {count}" for reason, count in report.rejection_counts.items()
+        )
+        samples = "; ".join(
+            f"{reason}: {urls}" for reason, urls in report.rejected_samples.items()
+        )
+        logger.warning(
+            f"{report.rejected_count} URL не соответствуют формату GitHub. "
+            f"Причины: {reasons}. Примеры: {samples}"
+        )
+    return report.project_names
+
+
+def iter_urls(
+    source: str | os.PathLike | IO[str] | Iterable[str] | None = None,
+) -> Iterator[str]:
+    """Лениво читает URL-адреса из файла, файлового объекта или stdin.
+
+    Args:
+        source: Путь к файлу, открытый файловый объект, любой итерируемый
+            набор строк либо None или "-" для чтения из stdin.
+
+    Yields:
+        URL-адреса по одному (строки файла могут содержать перевод строки).
+    """
+    if source is None or source == "-":
+        yield from sys.stdin
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8", errors="replace") as file:
+            yield from file
+    else:
+        yield from source
+
+
+def iter_github_project_names(
+    source: str | os.PathLike | IO[str] | Iterable[str] | None = None,
+    unique: bool = False,
+) -> Iterator[str]:
+    """Потоково извлекает названия проектов из большого набора URL-адресов.
+
+    В отличие от extract_github_project_names не держит входные данные в
+    памяти и не логирует каждый невалидный URL, поэтому подходит для дампов
+    с десятками миллионов ссылок.
+
+    Args:
+        source: Источник URL-адресов (см. iter_urls).
+        unique: Выдавать каждое название только один раз. Память в этом
+            режиме растёт с числом различных названий, а не ссылок.
+
+    Yields:
+        Названия проектов в порядке появления во входных данных.
+    """
+    seen = set()
+    for url in iter_urls(source):
+        if (parts := _match_github_url(url)) is None:
+            continue
+        project_name = parts[1]
+        if unique:
+            if project_name in seen:
+                continue
+            seen.add(project_name)
+        yield project_name
+
+
+class BloomFilter:
+    """Фильтр Блума для приблизительной проверки "уже встречалось".
+
+    Занимает фиксированный объём памяти, зависящий только от ожидаемого
+    количества элементов и допустимой доли ложноположительных ответов.
+    Ложноотрицательных ответов не бывает.
+    """
+
+    def __init__(
+        self, capacity: int, false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE
+    ):
+        """Инициализирует экземпляр класса BloomFilter.
+
+        Args:
+            capacity: Ожидаемое количество различных элементов.
+            false_positive_rate: Допустимая доля ложноположительных ответов.
+
+        Raises:
+            ValueError: Если параметры вне допустимого диапазона.
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False positive rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size_in_bits = max(
+            8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size_in_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.size_in_bits + 7) // 8)
+
+    def _bit_positions(self, item: str) -> Iterator[int]:
+        """Вычисляет позиции битов элемента методом двойного хэширования.
+
+        Args:
+            item: Элемент фильтра.
+
+        Yields:
+            Номера битов элемента.
+        """
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size_in_bits
+
+    def add(self, item: str) -> bool:
+        """Добавляет элемент в фильтр.
+
+        Args:
+            item: Элемент фильтра.
+
+        Returns:
+            True, если элемент (вероятно) уже был в фильтре.
+        """
+        bits = self._bits
+        seen = True
+        for position in self._bit_positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                seen = False
+        return seen
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._bit_positions(item)
+        )
+
+
+def iter_github_repos(
+    source: str | os.PathLike | IO[str] | Iterable[str] | None = None,
+) -> Iterator[str]:
+    """Потоково извлекает канонические имена репозиториев "owner/repo".
+
+    Имена пользователей и репозиториев на GitHub не чувствительны к
+    регистру, поэтому обе части приводятся к нижнему регистру, а суффикс
+    ".git" отбрасывается.
+
+    Args:
+        source: Источник URL-адресов (см. iter_urls).
+
+    Yields:
+        Канонические имена репозиториев для каждого валидного URL.
+    """
+    for url in iter_urls(source):
+        if (parts := _match_github_url(url)) is not None:
+            yield "/".join(parts).lower()
+
+
+def count_github_repos(
+    source: str | os.PathLike | IO[str] | Iterable[str] | None = None,
+) -> Counter:
+    """Строит индекс "owner/repo" с количеством упоминаний каждого
+    репозитория.
+
+    Args:
+        source: Источник URL-адресов (см. iter_urls).
+
+    Returns:
+        Счётчик (Counter) упоминаний канонических имён репозиториев.
+    """
+    return Counter(iter_github_repos(source))
+
+
+def iter_unique_github_repos(
+    source: str | os.PathLike | IO[str] | Iterable[str] | None = None,
+    expected_count: int | None = None,
+    false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE,
+) -> Iterator[str]:
+    """Выдаёт каждый репозиторий "owner/repo" только при первом появлении.
+
+    Args:
+        source: Источник URL-адресов (см. iter_urls).
+        expected_count: Ожидаемое количество различных репозиториев. Если
+            задано, вместо точного set используется BloomFilter с
+            фиксированным объёмом памяти: часть новых репозиториев (с долей
+            около false_positive_rate) может быть ошибочно пропущена.
+        false_positive_rate: Допустимая доля ложноположительных ответов
+            фильтра Блума.
+
+    Yields:
+        Канонические имена репозиториев без повторов.
+    """
+    if expected_count is None:
+        seen = set()
+        for repo in iter_github_repos(source):
+            if repo not in seen:
+                seen.add(repo)
+                yield repo
+    else:
+        bloom_filter = BloomFilter(expected_count, false_positive_rate)
+        for repo in iter_github_repos(source):
+            if not bloom_filter.add(repo):
+                yield repo
+
+
+def split_file_into_shards(
+    path: str | os.PathLike, shard_size: int = SHARD_SIZE
+) -> list[tuple[int, int]]:
+    """Разбивает файл на диапазоны байтов, выровненные по переводам строки.
+
+    Args:
+        path: Путь к файлу с URL-адресами (по одному на строку).
+        shard_size: Желаемый размер шарда в байтах.
+
+    Returns:
+        Список пар (начало, конец) в байтах; каждая строка файла целиком
+        попадает ровно в один шард.
+    """
+    file_size = os.path.getsize(path)
+    shards = []
+    with open(path, "rb") as file:
+        start = 0
+        while start < file_size:
+            end = start + shard_size
+            if end >= file_size:
+                end = file_size
+            else:
+                file.seek(end)
+                file.readline()
+                end = file.tell()
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def _extract_shard_project_names(
+    path: str | os.PathLike, start: int, end: int
+) -> set[bytes]:
+    """Извлекает уникальные названия проектов из одного шарда файла.
+
+    Args:
+        path: Путь к файлу с URL-адресами.
+        start: Начало шарда в байтах.
+        end: Конец шарда в байтах.
+
+    Returns:
+        Набор (set) названий проектов шарда в виде байтов.
+    """
+    match_url = GITHUB_URL_BYTES_REGEX.fullmatch
+    project_names = set()
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    for url in data.splitlines():
+        if (parts := _match_github_url(url, match_url, b".git")) is not None:
+            project_names.add(parts[1])
+    return project_names
+
+
+def extract_github_project_names_parallel(
+    path: str | os.PathLike,
+    workers: int | None = None,
+    shard_size: int = SHARD_SIZE,
+) -> set[str]:
+    """Извлекает названия проектов из большого файла на нескольких ядрах.
+
+    Файл режется на шарды по границам строк, каждый шард обрабатывается в
+    отдельном процессе, а наборы уникальных названий объединяются в конце.
+
+    Args:
+        path: Путь к файлу с URL-адресами (по одному на строку).
+        workers: Количество процессов. По умолчанию - количество ядер.
+        shard_size: Размер шарда в байтах.
+
+    Returns:
+        Набор (set) названий проектов из валидных URL-адресов.
+    """
+    shards = split_file_into_shards(path, shard_size)
     unique_project_names = set()
-    # Во время написания этого регулярного выражения пользовался
-    # следующими правилами с сайта GitHub:
-    # - Username may only contain alphanumeric characters or single hyphens,
-    # and cannot begin or end with a hyphen.
-    # - The repository name can only contain ASCII letters, digits, and the
-    # characters ., -, and _.
-    pattern = r"https://github\.com/([a-zA-Z\d](?:[a-zA-Z\d]|-(?=[a-zA-Z\d])){0,38})/([\w\.-]+)?"
-
-    for url in urls_set:
-        match = re.match(pattern, url)
-        if re.search("[а-яА-Я]", url) or not match:
-            logger.warning(f"URL {url!r} не соответствует формату GitHub.")
-        else:
-            project_name = match.group(2)
-            if project_name[-4:] == ".git":
-                project_name = project_name[:-4]
-            unique_project_names.add(project_name)
-
-    return unique_project_names
+    if not shards:
+        return unique_project_names
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_names in executor.map(
+            _extract_shard_project_names,
+            [path] * len(shards),
+            *zip(*shards),
+        ):
+            unique_project_names.update(shard_names)
+    return {project_name.decode() for project_name in unique_project_names}
+
+
+def benchmark_parallel_extraction(
+    count_of_urls: int = 2_000_000,
+    workers: int | None = None,
+    shard_size: int = 8 * 1024 * 1024,
+) -> dict[str, float]:
+    """Сравнивает время однопоточного и параллельного извлечения названий.
+
+    Args:
+        count_of_urls: Количество URL-адресов в сгенерированном файле.
+        workers: Количество процессов для параллельного режима.
+        shard_size: Размер шарда в байтах.
+
+    Returns:
+        Словарь со временем обоих режимов в секундах и ускорением.
+    """
+    invalid_urls = sorted(URLS)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "urls.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            for index in range(count_of_urls):
+                if index % 10:
+                    url = f"https://github.com/owner{index % 997}/project-{index}.git"
+                else:
+                    # Каждая десятая ссылка берётся из примеров, в т.ч. невалидных
+                    url = f"{invalid_urls[index // 10 % len(invalid_urls)]}{index}"
+                file.write(url + "\n")
+
+        begin = time.perf_counter()
+        with open(path, encoding="utf-8") as file:
+            urls_set = {line.rstrip("\n") for line in file}
+        serial_names = extract_github_project_names(urls_set)
+        serial_time = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        parallel_names = extract_github_project_names_parallel(
+            path, workers=workers, shard_size=shard_size
+        )
+        parallel_time = time.perf_counter() - begin
+
+    if serial_names != parallel_names:
+        logger.error("Результаты однопоточного и параллельного режимов различаются.")
+    result = {
+        "serial": serial_time,
+        "parallel": parallel_time,
+        "speedup": serial_time / parallel_time,
+    }
+    logger.info(
+        f"Однопоточный режим: {serial_time:.2f} сек, "
+        f"параллельный режим: {parallel_time:.2f} сек, "
+        f"ускорение: {result['speedup']:.2f}x"
+    )
+    return result
 
 
 def task_a():
@@ -6,10 +6,34 @@
 равна длине второго. Результат вывести в консоль.
 """
 
+import heapq
+import itertools
+import math
+import os
+import pickle  # nosec B403
+import random
+import tempfile
+from collections import Counter
+from collections.abc import Iterable, Iterator, MutableMapping
+from dataclasses import dataclass, field
+
 from logger.logger import create_logger
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy необязательная зависимость
+    np = None
+
 logger = create_logger(__name__)
 
+RUN_SIZE = 1_000_000
+# С какого количества ключей выгоднее векторизованная обработка чисел
+NUMPY_MIN_KEYS = 10_000
+# Целые числа, которые float64 представляет без потери точности
+MAX_EXACT_FLOAT_INT = 2**53
+# Сколько разных ключей с одним хэшем считается патологией
+COLLISION_THRESHOLD = 64
+
 
 class InvalidHash:
     """Класс, демонстрирующий невалидное поведение __hash__, возвращая строку
@@ -45,66 +69,563 @@ def sort_dict_with_different_key_types(dictionary: dict):
     Returns:
         Отсортированный словарь.
     """
-    strings = []
-    numbers = []
-    tuples = []
-    nones = []
-    undefined = []
-    for key in dictionary:
-        if isinstance(key, (float, int)):
-            numbers.append(key)
-        elif isinstance(key, str):
-            strings.append(key)
-        elif isinstance(key, tuple):
-            tuples.append(key)
-        elif key is None:
-            nones.append(key)
+    sorted_items = sorted(dictionary.items(), key=_item_sort_key)
+    if isinstance(dictionary, CollisionSafeDict):
+        return CollisionSafeDict(sorted_items, dictionary.colliding_hashes)
+    return dict(sorted_items)
+
+
+def _item_sort_key(item: tuple) -> tuple:
+    """Ключ сортировки пары (ключ, значение) по ключу словаря."""
+    return mixed_type_sort_key(item[0])
+
+
+def write_sorted_run(path: str | os.PathLike, items: dict | Iterable[tuple]) -> int:
+    """Сортирует пары (ключ, значение) и записывает их на диск как серию.
+
+    Args:
+        path: Путь к файлу серии.
+        items: Словарь или итерируемый набор пар (ключ, значение), который
+            помещается в память.
+
+    Returns:
+        Количество записанных пар.
+    """
+    if isinstance(items, dict):
+        items = items.items()
+    count = 0
+    with open(path, "wb") as file:
+        for count, item in enumerate(sorted(items, key=_item_sort_key), start=1):
+            pickle.dump(item, file, protocol=pickle.HIGHEST_PROTOCOL)
+    return count
+
+
+def iter_sorted_run(path: str | os.PathLike) -> Iterator[tuple]:
+    """Лениво читает с диска серию, записанную write_sorted_run.
+
+    Args:
+        path: Путь к файлу серии.
+
+    Yields:
+        Пары (ключ, значение) в отсортированном порядке.
+    """
+    with open(path, "rb") as file:
+        while True:
+            try:
+                # Серии создаются только write_sorted_run этого модуля.
+                yield pickle.load(file)  # nosec B301
+            except EOFError:
+                return
+
+
+def merge_sorted_runs(runs: Iterable[Iterable[tuple]]) -> Iterator[tuple]:
+    """Сливает уже отсортированные серии пар (ключ, значение) в одну.
+
+    Слияние устойчиво: равные по mixed_type_sort_key ключи выдаются в
+    порядке серий, поэтому результат совпадает с сортировкой их
+    конкатенации. Одновременно в памяти находится по одной паре из каждой
+    серии. Повторяющиеся в разных сериях ключи выдаются как есть.
+
+    Args:
+        runs: Итерируемый набор отсортированных серий (например,
+            iter_sorted_run для файлов на диске).
+
+    Yields:
+        Пары (ключ, значение) в общем отсортированном порядке.
+    """
+    return heapq.merge(*runs, key=_item_sort_key)
+
+
+def iter_sorted_items_external(
+    items: Iterable[tuple], run_size: int = RUN_SIZE
+) -> Iterator[tuple]:
+    """Сортирует пары (ключ, значение), не загружая их в память целиком.
+
+    Пары разбиваются на серии по run_size штук, каждая серия сортируется и
+    сохраняется во временный файл, после чего серии сливаются.
+
+    Args:
+        items: Итерируемый набор пар (ключ, значение).
+        run_size: Количество пар в одной серии.
+
+    Yields:
+        Пары (ключ, значение) в отсортированном порядке.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        iterator = iter(items)
+        while chunk := list(itertools.islice(iterator, run_size)):
+            path = os.path.join(directory, f"run_{len(paths)}.pickle")
+            write_sorted_run(path, chunk)
+            paths.append(path)
+        yield from merge_sorted_runs(iter_sorted_run(path) for path in paths)
+
+
+def mixed_type_sort_key(key) -> tuple:
+    """Возвращает ключ сортировки, задающий порядок ключей разных типов.
+
+    Порядок: None, прочие объекты, строки, числа, кортежи (по длине).
+    Прочие объекты и кортежи одной длины между собой равны, поэтому
+    устойчивая сортировка сохраняет их исходный порядок.
+
+    Args:
+        key: Ключ словаря.
+
+    Returns:
+        Кортеж (номер группы типа[, значение для сравнения]).
+    """
+    if isinstance(key, (float, int)):
+        return 3, key
+    if isinstance(key, str):
+        return 2, key
+    if isinstance(key, tuple):
+        return 4, len(key)
+    if key is None:
+        return (0,)
+    return (1,)
+
+
+class _SkipListNode:
+    """Узел списка с пропусками."""
+
+    __slots__ = ("sort_key", "key", "value", "forward")
+
+    def __init__(self, sort_key, key, value, level: int):
+        self.sort_key = sort_key
+        self.key = key
+        self.value = value
+        self.forward: list["_SkipListNode | None"] = [None] * level
+
+
+class SortedMapping(MutableMapping):
+    """Словарь, который всегда упорядочен по ключам разных типов.
+
+    Порядок ключей совпадает с sort_dict_with_different_key_types, но
+    поддерживается списком с пропусками: вставка, удаление и выборка
+    диапазона выполняются за O(log n) без пересортировки всего словаря, а
+    поиск значения по ключу - за O(1).
+    """
+
+    _MAX_LEVEL = 32
+    _LEVEL_PROBABILITY = 0.25
+
+    def __init__(self, items: Iterable | dict = ()):
+        """Инициализирует экземпляр класса SortedMapping.
+
+        Args:
+            items: Словарь или итерируемый набор пар (ключ, значение).
+        """
+        self._head = _SkipListNode(None, None, None, self._MAX_LEVEL)
+        self._level = 1
+        self._nodes: dict = {}
+        self._insertion_counter = itertools.count()
+        # Уровни узлов не связаны с безопасностью.
+        self._random = random.Random()  # nosec B311
+        self.update(items)
+
+    def _random_level(self) -> int:
+        level = 1
+        while (
+            level < self._MAX_LEVEL and self._random.random() < self._LEVEL_PROBABILITY
+        ):
+            level += 1
+        return level
+
+    def _predecessors(self, sort_key) -> list[_SkipListNode]:
+        """Находит на каждом уровне последний узел с меньшим ключом
+        сортировки.
+
+        Args:
+            sort_key: Ключ сортировки.
+
+        Returns:
+            Список узлов-предшественников по уровням.
+        """
+        update = [self._head] * self._MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            while (
+                next_node := node.forward[level]
+            ) is not None and next_node.sort_key < sort_key:
+                node = next_node
+            update[level] = node
+        return update
+
+    def __getitem__(self, key):
+        return self._nodes[key].value
+
+    def __setitem__(self, key, value):
+        if (node := self._nodes.get(key)) is not None:
+            node.value = value
+            return
+        # Номер вставки различает ключи, равные по mixed_type_sort_key.
+        sort_key = (mixed_type_sort_key(key), next(self._insertion_counter))
+        level = self._random_level()
+        update = self._predecessors(sort_key)
+        self._level = max(self._level, level)
+        node = _SkipListNode(sort_key, key, value, level)
+        for index in range(level):
+            node.forward[index] = update[index].forward[index]
+            update[index].forward[index] = node
+        self._nodes[key] = node
+
+    def __delitem__(self, key):
+        node = self._nodes.pop(key)
+        update = self._predecessors(node.sort_key)
+        for index, next_node in enumerate(node.forward):
+            if update[index].forward[index] is node:
+                update[index].forward[index] = next_node
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+
+    def __contains__(self, key) -> bool:
+        return key in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator:
+        node = self._head.forward[0]
+        while node is not None:
+            yield node.key
+            node = node.forward[0]
+
+    def _bound_sort_key(self, key, upper: bool):
+        if (node := self._nodes.get(key)) is not None:
+            return node.sort_key
+        return mixed_type_sort_key(key), math.inf if upper else -math.inf
+
+    def irange(
+        self,
+        minimum=None,
+        maximum=None,
+        inclusive: tuple[bool, bool] = (True, True),
+    ) -> Iterator:
+        """Выдаёт ключи из диапазона [minimum, maximum] по порядку.
+
+        Отсутствующая в словаре граница-кортеж или граница-объект охватывает
+        все равные ей по mixed_type_sort_key ключи.
+
+        Args:
+            minimum: Нижняя граница или None - без нижней границы.
+            maximum: Верхняя граница или None - без верхней границы.
+            inclusive: Включать ли нижнюю и верхнюю границы.
+
+        Yields:
+            Ключи в диапазоне.
+        """
+        if minimum is None:
+            node = self._head.forward[0]
         else:
-            undefined.append(key)
-    sorted_result = {}
-    for key in (
-        nones + undefined + sorted(strings) + sorted(numbers) + sorted(tuples, key=len)
-    ):
-        sorted_result[key] = dictionary[key]
-    return sorted_result
+            low = self._bound_sort_key(minimum, upper=False)
+            node = self._predecessors(low)[0].forward[0]
+            if node is not None and not inclusive[0] and node.sort_key == low:
+                node = node.forward[0]
+        high = None if maximum is None else self._bound_sort_key(maximum, upper=True)
+        while node is not None:
+            if high is not None and (
+                node.sort_key > high or (not inclusive[1] and node.sort_key == high)
+            ):
+                return
+            yield node.key
+            node = node.forward[0]
 
+    def __repr__(self) -> str:
+        items = ", ".join(f"{key!r}: {value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({{{items}}})"
 
-def make_sorted_dict(keys: list, values: list) -> dict:
-    """Функция для обработки списков ключей и значений, создания словаря и его
-    сортировки.
+
+@dataclass
+class HashDistributionReport:
+    """Распределение хэшей среди ключей.
+
+    Attributes:
+        total_keys: Количество различных (по id) хэшируемых ключей.
+        distinct_hashes: Количество различных значений хэша.
+        largest_bucket: Наибольшее количество ключей с одним хэшем.
+        colliding_hashes: Хэши, у которых ключей больше порога, и
+            количество ключей у каждого.
+    """
+
+    total_keys: int = 0
+    distinct_hashes: int = 0
+    largest_bucket: int = 0
+    colliding_hashes: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def collision_rate(self) -> float:
+        """Доля ключей, хэш которых совпал с хэшем другого ключа."""
+        if not self.total_keys:
+            return 0.0
+        return 1 - self.distinct_hashes / self.total_keys
+
+    @property
+    def is_pathological(self) -> bool:
+        """Есть ли хэши, у которых ключей больше порога."""
+        return bool(self.colliding_hashes)
+
+
+def measure_hash_distribution(
+    keys: Iterable, threshold: int = COLLISION_THRESHOLD
+) -> HashDistributionReport:
+    """Измеряет распределение хэшей среди ключей за O(n).
+
+    Один и тот же объект учитывается один раз; нехэшируемые ключи
+    пропускаются.
+
+    Args:
+        keys: Итерируемый набор ключей.
+        threshold: Сколько ключей с одним хэшем ещё считается нормой.
+
+    Returns:
+        Отчёт о распределении хэшей.
+    """
+    unique_keys = {id(key): key for key in keys}
+    bucket_sizes = Counter()
+    for key in unique_keys.values():
+        try:
+            bucket_sizes[hash(key)] += 1
+        except TypeError:
+            continue
+    return HashDistributionReport(
+        total_keys=bucket_sizes.total(),
+        distinct_hashes=len(bucket_sizes),
+        largest_bucket=max(bucket_sizes.values(), default=0),
+        colliding_hashes={
+            key_hash: size
+            for key_hash, size in bucket_sizes.items()
+            if size > threshold
+        },
+    )
+
+
+class _IdentityKey:
+    """Обёртка ключа, которая хэшируется и сравнивается по id объекта."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __hash__(self) -> int:
+        return id(self.key)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _IdentityKey) and other.key is self.key
+
+
+class CollisionSafeDict(MutableMapping):
+    """Словарь, который хранит ключи с патологическим хэшем по id.
+
+    Ключи, хэш которых входит в colliding_hashes и которые сравниваются по
+    умолчанию (по идентичности), хранятся обёрнутыми в _IdentityKey. Для
+    таких ключей сравнение по id совпадает с обычным, поэтому поведение
+    словаря не меняется, но вставка и поиск остаются O(1). Порядок вставки
+    сохраняется.
+    """
+
+    def __init__(self, items: Iterable | dict = (), colliding_hashes: Iterable = ()):
+        """Инициализирует экземпляр класса CollisionSafeDict.
+
+        Args:
+            items: Словарь или итерируемый набор пар (ключ, значение).
+            colliding_hashes: Хэши, ключи с которыми хранятся по id.
+        """
+        self.colliding_hashes = frozenset(colliding_hashes)
+        self._data: dict = {}
+        self.update(items)
+
+    def _storage_key(self, key):
+        if type(key).__eq__ is object.__eq__ and hash(key) in self.colliding_hashes:
+            return _IdentityKey(key)
+        return key
+
+    def __getitem__(self, key):
+        return self._data[self._storage_key(key)]
+
+    def __setitem__(self, key, value):
+        self._data[self._storage_key(key)] = value
+
+    def __delitem__(self, key):
+        del self._data[self._storage_key(key)]
+
+    def __contains__(self, key) -> bool:
+        return self._storage_key(key) in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator:
+        for key in self._data:
+            yield key.key if isinstance(key, _IdentityKey) else key
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(self, self._data.values())))
+
+
+def _build_dict(
+    keys: list, values: list, result_dict: MutableMapping | None = None
+) -> MutableMapping | None:
+    """Составляет словарь из списков ключей и значений без сортировки.
 
     Args:
         keys: Список ключей.
         values: Список значений.
+        result_dict: Пустой словарь для заполнения. По умолчанию - dict.
 
     Returns:
-        Отсортированный словарь, сформированный из ключей и значений.
+        Словарь, сформированный из ключей и значений, или None, если длины
+        списков совпадают.
     """
-    result_dict = {}
+    if result_dict is None:
+        result_dict = {}
     if len(keys) == len(values):
         logger.error("Длины списков ключей и словарей должны быть различны.")
+        return None
+    keys_iterator = iter(keys)
+    values_iterator = iter(values)
+    try:
+        while True:
+            key = next(keys_iterator)
+            try:
+                hash(key)
+                if key in result_dict:
+                    message = f"Ключ {key!r} уже использовался."
+                else:
+                    result_dict[key] = next(values_iterator)
+                    continue
+            except TypeError:
+                message = f"Ключ {key!r} - не хэшируемый объект"
+            logger.warning(message)
+    except StopIteration:
+        if unused_keys := list(keys_iterator):
+            logger.warning(f"Список неиспользуемых ключей: {unused_keys}")
+        if unused_values := list(values_iterator):
+            logger.warning(f"Список неиспользуемых значений: {unused_values}")
+        return result_dict
+
+
+def _make_sorted_numeric_dict(keys: list, values: list) -> dict | None:
+    """Векторизованно создаёт отсортированный словарь из числовых ключей.
+
+    Повторяет поведение _build_dict (первое вхождение ключа получает
+    следующее значение, повторы и неиспользованные элементы логируются),
+    но удаляет дубликаты и сортирует ключи средствами numpy.
+
+    Args:
+        keys: Список ключей.
+        values: Список значений.
+
+    Returns:
+        Отсортированный словарь или None, если ключи не однородно числовые
+        (тогда нужна обычная обработка).
+    """
+    key_types = set(map(type, keys))
+    if not key_types or not key_types <= {int, float}:
+        return None
+    if float in key_types:
+        if int in key_types and any(
+            type(key) is int and not -MAX_EXACT_FLOAT_INT <= key <= MAX_EXACT_FLOAT_INT
+            for key in keys
+        ):
+            return None
+        array = np.asarray(keys, dtype=np.float64)
+        if np.isnan(array).any():
+            # NaN не равен сам себе, поэтому дубликаты определяет только dict
+            return None
     else:
-        keys_iterator = iter(keys)
-        values_iterator = iter(values)
         try:
-            while True:
-                key = next(keys_iterator)
-                try:
-                    hash(key)
-                    if key in result_dict:
-                        message = f"Ключ {key!r} уже использовался."
-                    else:
-                        result_dict[key] = next(values_iterator)
-                        continue
-                except TypeError:
-                    message = f"Ключ {key!r} - не хэшируемый объект"
-                logger.warning(message)
-        except StopIteration:
-            if unused_keys := list(keys_iterator):
-                logger.warning(f"Список неиспользуемых ключей: {unused_keys}")
-            if unused_values := list(values_iterator):
-                logger.warning(f"Список неиспользуемых значений: {unused_values}")
-            return sort_dict_with_different_key_types(result_dict)
+            array = np.asarray(keys, dtype=np.int64)
+        except OverflowError:
+            return None
+
+    # Уникальные ключи по возрастанию и индексы их первых вхождений
+    _, first_indices = np.unique(array, return_index=True)
+    first_positions = np.sort(first_indices)
+    if len(first_positions) > len(values):
+        # Как и в _build_dict, ключ, которому не хватило значения, теряется
+        cutoff = int(first_positions[len(values)])
+        unused_keys = keys[cutoff + 1 :]
+        unused_values = []
+        first_indices = first_indices[first_indices < cutoff]
+    else:
+        cutoff = len(keys)
+        unused_keys = []
+        unused_values = values[len(first_positions) :]
+
+    is_duplicate = np.ones(cutoff, dtype=bool)
+    is_duplicate[first_positions[first_positions < cutoff]] = False
+    for position in np.flatnonzero(is_duplicate).tolist():
+        logger.warning(f"Ключ {keys[position]!r} уже использовался.")
+    if unused_keys:
+        logger.warning(f"Список неиспользуемых ключей: {unused_keys}")
+    if unused_values:
+        logger.warning(f"Список неиспользуемых значений: {unused_values}")
+
+    value_indices = np.searchsorted(first_positions, first_indices)
+    return dict(
+        zip(
+            map(keys.__getitem__, first_indices.tolist()),
+            map(values.__getitem__, value_indices.tolist()),
+        )
+    )
+
+
+def make_sorted_dict(
+    keys: list, values: list, collision_threshold: int | None = None
+) -> dict | CollisionSafeDict:
+    """Функция для обработки списков ключей и значений, создания словаря и его
+    сортировки.
+
+    Большие списки только из int и float обрабатываются векторизованно
+    через numpy, если он установлен.
+
+    Args:
+        keys: Список ключей.
+        values: Список значений.
+        collision_threshold: Если задан, перед построением измеряется
+            распределение хэшей ключей. Когда у одного хэша больше
+            collision_threshold ключей, результат строится как
+            CollisionSafeDict, чтобы построение не деградировало до O(n²).
+
+    Returns:
+        Отсортированный словарь, сформированный из ключей и значений.
+    """
+    if (
+        np is not None
+        and len(keys) >= NUMPY_MIN_KEYS
+        and len(keys) != len(values)
+        and (result_dict := _make_sorted_numeric_dict(keys, values)) is not None
+    ):
+        return result_dict
+    result_dict = None
+    if collision_threshold is not None:
+        report = measure_hash_distribution(keys, collision_threshold)
+        if report.is_pathological:
+            logger.warning(
+                f"Патологические коллизии хэшей: {report.colliding_hashes} "
+                f"(ключей: {report.total_keys}, "
+                f"доля коллизий: {report.collision_rate:.2%}). "
+                "Ключи с этими хэшами будут храниться по id."
+            )
+            result_dict = CollisionSafeDict(colliding_hashes=report.colliding_hashes)
+    if (result_dict := _build_dict(keys, values, result_dict)) is not None:
+        return sort_dict_with_different_key_types(result_dict)
+
+
+def make_sorted_mapping(keys: list, values: list) -> SortedMapping:
+    """Создаёт из списков ключей и значений SortedMapping, который можно
+    дальше изменять без пересортировки.
+
+    Args:
+        keys: Список ключей.
+        values: Список значений.
+
+    Returns:
+        Упорядоченный по ключам SortedMapping.
+    """
+    if (result_dict := _build_dict(keys, values)) is not None:
+        return SortedMapping(result_dict)
 
 
 KEYS = [
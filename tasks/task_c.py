@@ -6,10 +6,34 @@
 int - то его значение нужно возвести в квадрат. Результат вывести в консоль.
 """
 
+import os
+import time
+from array import array
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain, compress, islice, repeat
+from operator import not_
+
 from logger.logger import create_logger
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy необязательная зависимость
+    np = None
+
 logger = create_logger(__name__)
 
+# С какого размера списка выгоднее пакетная обработка через numpy
+NUMPY_MIN_ITEMS = 10_000
+BATCH_SIZE = 65_536
+# Размер пакета потоковой валидации и модификации
+CHUNK_SIZE = 10_000
+# Размер пакета, отправляемого в процесс при параллельной обработке
+PARALLEL_CHUNK_SIZE = 500_000
+# Наибольшее по модулю int64, квадрат которого ещё помещается в int64
+MAX_INT64_SQUARE_ROOT = 3_037_000_499
+
 
 def modify_list(data: list[str | int]) -> list[str | int]:
     """Модифицирует список, добавляя префиксы и суффиксы к строкам и возводя
@@ -27,6 +51,115 @@ def modify_list(data: list[str | int]) -> list[str | int]:
     return modified_data
 
 
+def _square_batch(numbers: list) -> list:
+    """Возводит числа в квадрат пакетно, без переполнения.
+
+    Через numpy обрабатываются только пакеты, где все элементы ровно int
+    (не bool и не другие подклассы) и квадраты помещаются в int64.
+
+    Args:
+        numbers: Список нестроковых элементов.
+
+    Returns:
+        Список квадратов.
+    """
+    if numbers and set(map(type, numbers)) == {int}:
+        try:
+            values = np.asarray(numbers, dtype=np.int64)
+        except OverflowError:
+            values = None
+        if (
+            values is not None
+            and values.max() <= MAX_INT64_SQUARE_ROOT
+            and values.min() >= -MAX_INT64_SQUARE_ROOT
+        ):
+            return (values * values).tolist()
+    # Большие числа и прочие типы возводятся в квадрат средствами Python
+    return [number**2 for number in numbers]
+
+
+def _merge_by_mask(is_string: Iterable, numbers: Iterable, strings: Iterable) -> list:
+    """Собирает элементы в исходном порядке из двух источников по маске.
+
+    Args:
+        is_string: Маска типов: истина на позициях строк.
+        numbers: Элементы для позиций, где маска ложна.
+        strings: Элементы для позиций, где маска истинна.
+
+    Returns:
+        Список элементов в порядке маски.
+    """
+    # Для каждой позиции берём следующий элемент из нужного источника:
+    # sources[False] - числа, sources[True] - строки.
+    sources = [iter(numbers), iter(strings)]
+    return list(map(next, map(sources.__getitem__, is_string)))
+
+
+def _modify_batch(data: list[str | int]) -> list[str | int]:
+    """Модифицирует один пакет элементов, разделяя их по типу один раз.
+
+    Args:
+        data (list): Пакет элементов (строки и числа).
+
+    Returns:
+        list: Модифицированный пакет.
+    """
+    item_types = set(map(type, data))
+    # Подклассы str (например, StrEnum) обрабатываются как строки, как и в
+    # modify_list, где тип проверяется через isinstance
+    string_types = {item_type for item_type in item_types if issubclass(item_type, str)}
+    if string_types == item_types:
+        return [f"abc_{string}_cba" for string in data]
+    if not string_types:
+        return _square_batch(data)
+    is_string = list(map(isinstance, data, repeat(str)))
+    strings = [f"abc_{string}_cba" for string in compress(data, is_string)]
+    numbers = _square_batch(list(compress(data, map(not_, is_string))))
+    return _merge_by_mask(is_string, numbers, strings)
+
+
+def modify_list_batch(
+    data: list[str | int], batch_size: int = BATCH_SIZE
+) -> list[str | int]:
+    """Пакетный вариант modify_list для больших списков.
+
+    Список обрабатывается пакетами по batch_size элементов. В каждом пакете
+    элементы один раз делятся по типу: целые числа возводятся в квадрат
+    массивом numpy, строки "abc_..._cba" строятся отдельным проходом без
+    проверки типа, после чего результаты расставляются по исходным
+    позициям. Однородные пакеты обходятся без расстановки. Результат
+    поэлементно совпадает с modify_list. Без numpy или на маленьких списках
+    просто вызывает modify_list.
+
+    Args:
+        data (list): Список элементов (строки и числа).
+        batch_size: Размер пакета.
+
+    Returns:
+        list: Модифицированный список.
+    """
+    if np is None or len(data) < NUMPY_MIN_ITEMS:
+        return modify_list(data)
+    modified_data = []
+    for start in range(0, len(data), batch_size):
+        modified_data.extend(_modify_batch(data[start : start + batch_size]))
+    return modified_data
+
+
+def is_valid_value(value) -> bool:
+    """Проверяет, что элемент - строка или цифра.
+
+    Args:
+        value: Проверяемый элемент.
+
+    Returns:
+        True, если элемент подходит по условию.
+    """
+    value_type = type(value)
+    # В условии сказано только цифры
+    return value_type is str or (value_type is int and 0 <= value <= 9)
+
+
 def strict_validation(data: list[str | int]) -> list[str | int]:
     """Выполняет строгую валидацию списка, удаляя невалидные элементы.
 
@@ -36,19 +169,277 @@ def strict_validation(data: list[str | int]) -> list[str | int]:
     Returns:
         list: Список с удаленными невалидными элементами.
     """
+    valid_values = []
     invalid_values = []
     for value in data:
-        if type(value) not in [int, str]:
+        if is_valid_value(value):
+            valid_values.append(value)
+        else:
             invalid_values.append(value)
-        if type(value) is int:  # noqa
-            # В условии сказано только цифры
-            if value > 9 or value < 0:
-                invalid_values.append(value)
     if invalid_values:
         logger.warning(f"Неподходящие по условию значения: {invalid_values}")
-    return [
-        correct_value for correct_value in data if correct_value not in invalid_values
+    return valid_values
+
+
+def iter_validated_modified(
+    data: Iterable,
+    chunk_size: int = CHUNK_SIZE,
+    on_invalid: Callable[[object], None] | None = None,
+    counter: Counter | None = None,
+) -> Iterator[list[str | int]]:
+    """Валидирует и модифицирует элементы за один потоковый проход.
+
+    Объединяет strict_validation и modify_list: каждый элемент проверяется
+    и сразу преобразуется, невалидные элементы отбрасываются. Работает с
+    любым итерируемым объектом и держит в памяти только один пакет.
+
+    Args:
+        data: Итерируемый набор элементов.
+        chunk_size: Количество входных элементов в одном пакете.
+        on_invalid: Функция, которая вызывается для каждого невалидного
+            элемента.
+        counter: Счётчик, в котором накапливаются количества "valid" и
+            "invalid" элементов.
+
+    Yields:
+        Пакеты модифицированных валидных элементов в исходном порядке.
+    """
+    iterator = iter(data)
+    while chunk := list(islice(iterator, chunk_size)):
+        modified_chunk = []
+        for value in chunk:
+            value_type = type(value)
+            if value_type is str:
+                modified_chunk.append(f"abc_{value}_cba")
+            elif value_type is int and 0 <= value <= 9:
+                modified_chunk.append(value * value)
+            elif on_invalid is not None:
+                on_invalid(value)
+        if counter is not None:
+            counter["valid"] += len(modified_chunk)
+            counter["invalid"] += len(chunk) - len(modified_chunk)
+        yield modified_chunk
+
+
+def _encode_chunk(chunk: list) -> tuple:
+    """Компактно упаковывает пакет для передачи между процессами.
+
+    Пакет только из int и str передаётся как маска типов (bytes), массив
+    чисел array("q") и список строк, что заметно дешевле pickle списка
+    Python-объектов. Остальные пакеты передаются как есть.
+
+    Args:
+        chunk: Пакет элементов.
+
+    Returns:
+        Упакованный пакет.
+    """
+    if set(map(type, chunk)) <= {int, str}:
+        is_string = bytes(map(isinstance, chunk, repeat(str)))
+        try:
+            numbers = array("q", compress(chunk, map(not_, is_string)))
+        except OverflowError:
+            return (chunk,)
+        return is_string, numbers, list(compress(chunk, is_string))
+    return (chunk,)
+
+
+def _decode_chunk(payload: tuple) -> list:
+    """Распаковывает пакет, упакованный _encode_chunk.
+
+    Args:
+        payload: Упакованный пакет.
+
+    Returns:
+        Пакет элементов в исходном порядке.
+    """
+    if len(payload) == 1:
+        return payload[0]
+    return _merge_by_mask(*payload)
+
+
+def _process_chunk(payload: tuple) -> tuple[tuple, int]:
+    """Валидирует и модифицирует упакованный пакет в процессе-обработчике.
+
+    Args:
+        payload: Пакет, упакованный _encode_chunk.
+
+    Returns:
+        Упакованный пакет модифицированных валидных элементов и количество
+        невалидных элементов.
+    """
+    chunk = _decode_chunk(payload)
+    counter = Counter()
+    modified_chunk = list(
+        chain.from_iterable(
+            iter_validated_modified(chunk, chunk_size=len(chunk), counter=counter)
+        )
+    )
+    return _encode_chunk(modified_chunk), counter["invalid"]
+
+
+def iter_batches(data: Iterable, batch_size: int) -> Iterator[list]:
+    """Лениво режет итерируемый объект на пакеты.
+
+    Args:
+        data: Итерируемый набор элементов.
+        batch_size: Количество элементов в одном пакете.
+
+    Yields:
+        Списки по batch_size элементов, последний может быть короче.
+    """
+    iterator = iter(data)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def iter_parallel_map(
+    function: Callable, batches: Iterable, workers: int | None = None
+) -> Iterator:
+    """Применяет function к пакетам в пуле процессов, сохраняя порядок.
+
+    В отличие от Executor.map пакеты берутся из batches по мере обработки:
+    одновременно в работе находится не больше двух пакетов на процесс,
+    поэтому batches может быть большим ленивым генератором.
+
+    Args:
+        function: Функция уровня модуля, применяемая к каждому пакету.
+        batches: Итерируемый набор пакетов.
+        workers: Количество процессов. По умолчанию - количество ядер.
+
+    Yields:
+        Результаты function в порядке пакетов.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in batches:
+            pending.append(executor.submit(function, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def modify_list_parallel(
+    data: Iterable,
+    workers: int | None = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+    counter: Counter | None = None,
+) -> list[str | int]:
+    """Выполняет strict_validation и modify_list в пуле процессов.
+
+    Вход режется на пакеты по chunk_size элементов, пакеты компактно
+    упаковываются и обрабатываются параллельно, а результаты собираются в
+    исходном порядке. Одновременно в обработке находится не больше двух
+    пакетов на процесс, поэтому вход может быть любым итерируемым объектом.
+
+    Args:
+        data: Итерируемый набор элементов (строки и числа).
+        workers: Количество процессов. По умолчанию - количество ядер.
+        chunk_size: Количество элементов в одном пакете.
+        counter: Счётчик, в котором накапливаются количества "valid" и
+            "invalid" элементов.
+
+    Returns:
+        list: Модифицированный список валидных элементов.
+    """
+    modified_data = []
+    invalid_count = 0
+    payloads = map(_encode_chunk, iter_batches(data, chunk_size))
+    for payload, chunk_invalid_count in iter_parallel_map(
+        _process_chunk, payloads, workers
+    ):
+        modified_data.extend(_decode_chunk(payload))
+        invalid_count += chunk_invalid_count
+
+    if invalid_count:
+        logger.warning(f"Количество неподходящих по условию значений: {invalid_count}")
+    if counter is not None:
+        counter["valid"] += len(modified_data)
+        counter["invalid"] += invalid_count
+    return modified_data
+
+
+def benchmark_modify_list_parallel(
+    sizes: Iterable[int] = (100_000, 1_000_000, 5_000_000),
+    workers: int | None = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> dict[int, dict[str, float]]:
+    """Сравнивает последовательный и параллельный режимы на разных размерах.
+
+    Args:
+        sizes: Размеры входных списков.
+        workers: Количество процессов для параллельного режима.
+        chunk_size: Количество элементов в одном пакете.
+
+    Returns:
+        Словарь размер -> время обоих режимов в секундах и ускорение.
+    """
+    results = {}
+    for size in sizes:
+        data = [index % 10 if index % 2 else f"word{index}" for index in range(size)]
+
+        begin = time.perf_counter()
+        expected = modify_list(strict_validation(data))
+        serial_time = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        result = modify_list_parallel(data, workers=workers, chunk_size=chunk_size)
+        parallel_time = time.perf_counter() - begin
+
+        if result != expected:
+            logger.error(
+                "Результаты последовательного и параллельного режимов различаются."
+            )
+        results[size] = {
+            "serial": serial_time,
+            "parallel": parallel_time,
+            "speedup": serial_time / parallel_time,
+        }
+        logger.info(
+            f"Размер {size}: последовательно {serial_time:.2f} сек, "
+            f"параллельно {parallel_time:.2f} сек, "
+            f"ускорение: {results[size]['speedup']:.2f}x"
+        )
+    return results
+
+
+def benchmark_modify_list(
+    size: int = 1_000_000, run_length: int = BATCH_SIZE, repeat_count: int = 3
+) -> dict[str, float]:
+    """Сравнивает время modify_list и modify_list_batch.
+
+    Args:
+        size: Размер списка.
+        run_length: Длина однородных участков из чисел и строк.
+        repeat_count: Сколько раз повторить замер (берётся лучшее время).
+
+    Returns:
+        Словарь с лучшим временем обоих вариантов в секундах и ускорением.
+    """
+    data = [
+        index if index // run_length % 2 else f"word{index}" for index in range(size)
     ]
+    expected = modify_list(data)
+    if modify_list_batch(data) != expected:
+        logger.error("Результаты modify_list и modify_list_batch различаются.")
+
+    timings = {}
+    for function in (modify_list, modify_list_batch):
+        best_time = float("inf")
+        for _ in range(repeat_count):
+            begin = time.perf_counter()
+            function(data)
+            best_time = min(best_time, time.perf_counter() - begin)
+        timings[function.__name__] = best_time
+    timings["speedup"] = timings["modify_list"] / timings["modify_list_batch"]
+    logger.info(
+        f"modify_list: {timings['modify_list']:.2f} сек, "
+        f"modify_list_batch: {timings['modify_list_batch']:.2f} сек, "
+        f"ускорение: {timings['speedup']:.2f}x"
+    )
+    return timings
 
 
 def task_c():
@@ -8,170 +8,1303 @@ http://httpbin.org/delay/3.
 Результат замера времени выводит в консоль. Ожидаемое время не должно превышать 10 секунд.
 """
 
+import json
+import math
+import multiprocessing
+import os
+import queue
+import random
 import time
-from asyncio import ensure_future, events, run
-from asyncio.queues import Queue
+import zlib
+from asyncio import (
+    FIRST_COMPLETED,
+    Queue,
+    Task,
+    create_task,
+    gather,
+    get_running_loop,
+    run,
+    sleep,
+    wait,
+)
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from enum import StrEnum
 from functools import partial
+from itertools import cycle, islice
 
 import aiohttp
-import nest_asyncio
 
 from logger.logger import create_logger
+from tasks.delay_server import DelayServerConfig, delay_server_in_thread
 
 logger = create_logger(__name__)
-nest_asyncio.apply()
 
 COUNT_OF_REQUESTS = 100
 CONCURRENCY = 1000
 DELAY_URL = "http://httpbin.org/delay/3"
+TIMEOUT = 10
 TIMEOUT_ERROR_MESSAGE = "Timeout_Error"
+CONNECTION_ERROR_MESSAGE = "Connection_Error"
+BODY_TOO_LARGE_MESSAGE = "Body_Too_Large"
+# Чтение тела ответа: размер части и наибольший допустимый размер тела
+BODY_CHUNK_SIZE = 64 * 1024
+MAX_BODY_SIZE = 10 * 1024 * 1024
+# Параметры пула соединений с keep-alive
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 0  # 0 - без ограничения на один хост
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 15
+# Точность гистограммы задержек: 2**7 поддиапазонов на каждую степень двойки,
+# относительная погрешность не больше 1/64
+HISTOGRAM_SUB_BUCKET_BITS = 7
+REPORTED_PERCENTILES = (50, 90, 99, 99.9)
+# Как часто процессы нагрузки отправляют статистику родителю, в секундах
+REPORT_INTERVAL = 1.0
+# Насколько запрос открытой модели может опоздать, чтобы не считаться поздним
+LATE_DISPATCH_THRESHOLD = 0.005
+# Повторы: количество, база и потолок экспоненциальной паузы в секундах
+RETRY_ATTEMPTS = 2
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 2.0
+# Дублирование: процентиль задержки, после которого отправляется дубликат,
+# и пауза до дубликата, пока задержек накоплено меньше HEDGE_MIN_SAMPLES
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_INITIAL_DELAY = 1.0
 
 
-async def make_numbers(count: int) -> int:
-    """Асинхронный генератор, который последовательно выдаёт числа от 0 до
-    count-1.
+class ConnectionMode(StrEnum):
+    """Режим работы HTTP-клиента с соединениями."""
 
-    Args:
-        count: Количество чисел для генерации.
+    # Новое TCP-соединение и DNS-запрос на каждый HTTP-запрос
+    FRESH = "fresh"
+    # Пул keep-alive соединений с кэшем DNS и ограничениями на количество
+    POOLED = "pooled"
 
-    Yields:
-        int: Следующее число в последовательности.
+
+class BodyMode(StrEnum):
+    """Режим обработки тела ответа."""
+
+    # Только код ответа, тело не читается, соединение освобождается сразу
+    STATUS_ONLY = "status_only"
+    # Тело читается частями по BODY_CHUNK_SIZE байт и отбрасывается
+    DISCARD = "discard"
+    # Как DISCARD, но дополнительно считается контрольная сумма CRC32
+    CHECKSUM = "checksum"
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с логарифмическими корзинами (в стиле HDR).
+
+    Задержки хранятся в микросекундах. Значения меньше 2**bits хранятся
+    точно, большие - в корзинах, ширина которых растёт вместе со значением,
+    поэтому память не зависит от количества запросов. Гистограммы можно
+    складывать (merge) и сохранять в JSON.
+    """
+
+    def __init__(self, sub_bucket_bits: int = HISTOGRAM_SUB_BUCKET_BITS):
+        """Инициализирует экземпляр класса LatencyHistogram.
+
+        Args:
+            sub_bucket_bits: Количество бит точности корзин.
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Counter = Counter()
+        self.count = 0
+        self.total = 0
+        self.min: int | None = None
+        self.max: int | None = None
+
+    def _bucket_index(self, value: int) -> int:
+        sub_bucket_count = 1 << self.sub_bucket_bits
+        if value < sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        half = sub_bucket_count >> 1
+        return sub_bucket_count + (shift - 1) * half + (value >> shift) - half
+
+    def _bucket_bounds(self, index: int) -> tuple[int, int]:
+        sub_bucket_count = 1 << self.sub_bucket_bits
+        if index < sub_bucket_count:
+            return index, index
+        half = sub_bucket_count >> 1
+        shift, offset = divmod(index - sub_bucket_count, half)
+        shift += 1
+        lower = (offset + half) << shift
+        return lower, lower + (1 << shift) - 1
+
+    def record(self, seconds: float):
+        """Добавляет в гистограмму одну задержку.
+
+        Args:
+            seconds: Задержка в секундах.
+        """
+        value = max(0, round(seconds * 1_000_000))
+        self.counts[self._bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Добавляет к гистограмме значения другой гистограммы.
+
+        Args:
+            other: Гистограмма с той же точностью.
+
+        Raises:
+            ValueError: Если точность гистограмм различается.
+        """
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Histograms with different precision can't be merged.")
+        if not other.count:
+            return
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float | None:
+        """Возвращает задержку, которую не превышают percent% запросов.
+
+        Args:
+            percent: Процентиль от 0 до 100.
+
+        Returns:
+            Задержка в секундах (верхняя граница корзины, но не больше
+            максимума) или None, если гистограмма пуста.
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._bucket_bounds(index)[1], self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def summary(self) -> dict:
+        """Возвращает основные характеристики распределения задержек.
+
+        Returns:
+            Словарь с количеством, min, max, средним и процентилями в
+            секундах.
+        """
+        if not self.count:
+            return {"count": 0}
+        result = {
+            "count": self.count,
+            "min": self.min / 1_000_000,
+            "max": self.max / 1_000_000,
+            "mean": self.total / self.count / 1_000_000,
+        }
+        for percent in REPORTED_PERCENTILES:
+            result[f"p{percent:g}"] = self.percentile(percent)
+        return result
+
+    def to_dict(self) -> dict:
+        """Сериализует гистограмму в словарь, пригодный для JSON."""
+        return {
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "counts": {str(index): count for index, count in self.counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        """Восстанавливает гистограмму из словаря, созданного to_dict."""
+        histogram = cls(data["sub_bucket_bits"])
+        histogram.counts = Counter(
+            {int(index): count for index, count in data["counts"].items()}
+        )
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class LoadStats:
+    """Статистика нагрузочного прогона.
+
+    Хранит количество кодов ответов, гистограмму задержек, объём и
+    контрольные суммы прочитанных тел ответов и посекундную шкалу
+    пропускной способности и ошибок. Память зависит только от длительности
+    прогона (и количества различных тел ответов), но не от количества
+    запросов.
     """
-    for i in range(count):
-        yield i
 
+    def __init__(self, started_at: float | None = None):
+        """Инициализирует экземпляр класса LoadStats.
+
+        Args:
+            started_at: Начало прогона по time.perf_counter(). По умолчанию -
+                текущее время.
+        """
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.latency = LatencyHistogram()
+        self._reset()
+
+    def _reset(self):
+        """Обнуляет накопленную статистику, сохраняя начало прогона."""
+        self.status_counts: Counter = Counter()
+        self.latency = LatencyHistogram(self.latency.sub_bucket_bits)
+        self.requests_per_second: Counter = Counter()
+        self.errors_per_second: Counter = Counter()
+        self.bytes_per_second: Counter = Counter()
+        self.body_checksums: Counter = Counter()
+        # Дополнительные попытки, которые увеличивают нагрузку на сервер
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+
+    @staticmethod
+    def is_error(status) -> bool:
+        """Считается ли результат запроса ошибкой."""
+        return not isinstance(status, int) or status >= 400
+
+    def record(self, status, latency: float, finished_at: float | None = None):
+        """Добавляет в статистику результат одного запроса.
+
+        Args:
+            status: Код ответа или сообщение об ошибке.
+            latency: Задержка запроса в секундах.
+            finished_at: Время завершения по time.perf_counter(). По
+                умолчанию - текущее время.
+        """
+        if finished_at is None:
+            finished_at = time.perf_counter()
+        second = int(finished_at - self.started_at)
+        self.status_counts[status] += 1
+        self.latency.record(latency)
+        self.requests_per_second[second] += 1
+        if self.is_error(status):
+            self.errors_per_second[second] += 1
+
+    def record_body(self, size: int, checksum: int | None = None):
+        """Добавляет в статистику прочитанное тело ответа.
+
+        Args:
+            size: Количество прочитанных байт.
+            checksum: Контрольная сумма CRC32 тела или None, если не
+                считалась.
+        """
+        second = int(time.perf_counter() - self.started_at)
+        self.bytes_per_second[second] += size
+        if checksum is not None:
+            self.body_checksums[checksum] += 1
+
+    @property
+    def bytes_received(self) -> int:
+        """Общее количество прочитанных байт тел ответов."""
+        return self.bytes_per_second.total()
+
+    def merge(self, other: "LoadStats"):
+        """Добавляет статистику другого прогона, начатого одновременно.
+
+        Args:
+            other: Статистика другого прогона.
+        """
+        self.status_counts.update(other.status_counts)
+        self.latency.merge(other.latency)
+        self.requests_per_second.update(other.requests_per_second)
+        self.errors_per_second.update(other.errors_per_second)
+        self.bytes_per_second.update(other.bytes_per_second)
+        self.body_checksums.update(other.body_checksums)
+        self.hedges += other.hedges
+        self.hedge_wins += other.hedge_wins
+        self.retries += other.retries
+
+    def timeline(self, sparse: bool = False) -> list[dict]:
+        """Возвращает посекундную шкалу запросов, ошибок и прочитанных байт.
+
+        Args:
+            sparse: Возвращать только секунды, в которые были запросы или
+                прочитанные байты.
+
+        Returns:
+            Список словарей {"second", "requests", "errors", "bytes"} по
+            порядку.
+        """
+        if sparse:
+            seconds = sorted(self.requests_per_second.keys() | self.bytes_per_second)
+        else:
+            last_second = max(
+                max(self.requests_per_second, default=-1),
+                max(self.bytes_per_second, default=-1),
+            )
+            seconds = range(last_second + 1)
+        return [
+            {
+                "second": second,
+                "requests": self.requests_per_second[second],
+                "errors": self.errors_per_second[second],
+                "bytes": self.bytes_per_second[second],
+            }
+            for second in seconds
+        ]
+
+    def report(self, sparse_timeline: bool = False) -> dict:
+        """Формирует итоговый отчёт прогона.
+
+        Args:
+            sparse_timeline: Включать в шкалу только ненулевые секунды.
+
+        Returns:
+            Словарь с кодами ответов, характеристиками задержек,
+            количеством дополнительных попыток и шкалой пропускной
+            способности.
+        """
+        return {
+            "status_counts": {
+                str(status): count for status, count in self.status_counts.items()
+            },
+            "latency": self.latency.summary(),
+            "bytes_received": self.bytes_received,
+            "body_checksums": {
+                f"{checksum:08x}": count
+                for checksum, count in self.body_checksums.items()
+            },
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retries,
+            "timeline": self.timeline(sparse_timeline),
+        }
+
+    def to_dict(self, sparse_timeline: bool = False) -> dict:
+        """Сериализует статистику вместе с гистограммой для слияния.
+
+        Args:
+            sparse_timeline: Включать в шкалу только ненулевые секунды.
+        """
+        return {
+            **self.report(sparse_timeline),
+            "histogram": self.latency.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LoadStats":
+        """Восстанавливает статистику из словаря, созданного to_dict.
 
-async def make_async_gen(f: callable, q: int):
-    """Асинхронный генератор, который применяет функцию f к каждому числу,
-    сгенерированному make_numbers(q), и выдаёт результаты.
+        Шкала пропускной способности восстанавливается относительно начала
+        исходного прогона.
+        """
+        stats = cls()
+        stats.status_counts = Counter(
+            {
+                int(status) if status.isdigit() else status: count
+                for status, count in data["status_counts"].items()
+            }
+        )
+        stats.latency = LatencyHistogram.from_dict(data["histogram"])
+        for point in data["timeline"]:
+            if point["requests"]:
+                stats.requests_per_second[point["second"]] = point["requests"]
+            if point["errors"]:
+                stats.errors_per_second[point["second"]] = point["errors"]
+            if point["bytes"]:
+                stats.bytes_per_second[point["second"]] = point["bytes"]
+        stats.body_checksums = Counter(
+            {
+                int(checksum, 16): count
+                for checksum, count in data["body_checksums"].items()
+            }
+        )
+        stats.hedges = data["hedges"]
+        stats.hedge_wins = data["hedge_wins"]
+        stats.retries = data["retries"]
+        return stats
+
+    def pop_delta(self) -> dict:
+        """Возвращает накопленную статистику и обнуляет её.
+
+        Нужна для потоковой передачи статистики порциями: сумма всех порций,
+        собранная через from_dict и merge, равна полной статистике. Шкала
+        порции разреженная, поэтому размер порции не растёт с длительностью
+        прогона.
+
+        Returns:
+            Словарь to_dict с накопленной с прошлого вызова статистикой.
+        """
+        delta = self.to_dict(sparse_timeline=True)
+        self._reset()
+        return delta
+
+    def to_json(self, **kwargs) -> str:
+        """Сериализует статистику в JSON для сравнения прогонов.
+
+        Args:
+            **kwargs: Аргументы json.dumps.
+
+        Returns:
+            Строка JSON.
+        """
+        kwargs.setdefault("ensure_ascii", False)
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+# Сигнал о том, что обработчик пула закончил работу
+_WORKER_DONE = object()
+
+
+class _JobFailure:
+    """Исключение задачи, переданное из обработчика пула потребителю."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+async def as_completed_pool(
+    job: Callable[..., Awaitable], items: Iterable, concurrency: int
+) -> AsyncIterator:
+    """Выполняет job для каждого элемента items фиксированным пулом
+    корутин-обработчиков и выдаёт результаты по мере готовности.
+
+    Обработчики берут элементы из общего итератора, поэтому новые задачи и
+    вложенные циклы событий не создаются: накладные расходы планировщика не
+    растут с количеством запросов.
 
     Args:
-        f: Функция для применения к каждому числу.
-        q: Количество чисел для генерации.
+        job: Асинхронная функция, применяемая к каждому элементу.
+        items: Итерируемый набор аргументов для job.
+        concurrency: Количество обработчиков (одновременных вызовов job).
 
     Yields:
-        Результат применения функции f к числу.
+        Результаты job в порядке завершения.
+
+    Raises:
+        Exception: Исключение, выброшенное job, пробрасывается потребителю.
     """
-    async for x in make_numbers(q):
-        yield f(x)
+    results = Queue()
+    source = iter(items)
+
+    async def _worker():
+        try:
+            for item in source:
+                try:
+                    results.put_nowait(await job(item))
+                except Exception as error:  # pylint: disable=broad-except
+                    results.put_nowait(_JobFailure(error))
+                    return
+        finally:
+            results.put_nowait(_WORKER_DONE)
+
+    workers = [create_task(_worker()) for _ in range(concurrency)]
+    try:
+        active_workers = len(workers)
+        while active_workers:
+            result = await results.get()
+            if result is _WORKER_DONE:
+                active_workers -= 1
+            elif isinstance(result, _JobFailure):
+                raise result.error
+            else:
+                yield result
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await gather(*workers, return_exceptions=True)
 
 
-def as_completed_for_async_gen(fs_async_gen: callable, concurrency: int):
-    """Функция, которая запускает задачи из асинхронного генератора
-    fs_async_gen с ограничением параллелизма concurrency и выдаёт результаты по
-    мере их готовности.
+def make_session(
+    connection_mode: ConnectionMode = ConnectionMode.FRESH,
+    timeout: float = TIMEOUT,
+    connection_limit: int = CONNECTION_LIMIT,
+    connection_limit_per_host: int = CONNECTION_LIMIT_PER_HOST,
+) -> aiohttp.ClientSession:
+    """Создаёт сессию aiohttp с нужным режимом соединений.
 
     Args:
-        fs_async_gen: Асинхронный генератор, который выдаёт задачи.
-        concurrency: Максимальное количество одновременно выполняющихся задач.
+        connection_mode: Режим работы с соединениями.
+        timeout: Общий тайм-аут одного запроса в секундах.
+        connection_limit: Общее ограничение на количество соединений в
+            режиме POOLED.
+        connection_limit_per_host: Ограничение на количество соединений с
+            одним хостом в режиме POOLED.
 
-    Yields:
-        Результат выполненной задачи.
+    Returns:
+        Сессия aiohttp.ClientSession.
     """
-    done = Queue()
-    loop = events.get_event_loop()
-    todo = set()
+    if connection_mode is ConnectionMode.POOLED:
+        connector = aiohttp.TCPConnector(
+            limit=connection_limit,
+            limit_per_host=connection_limit_per_host,
+            ssl=False,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+    else:
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            ssl=False,
+            use_dns_cache=False,
+            force_close=True,
+        )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+    # aiohttp молча повторяет GET после обрыва соединения. Такой повтор не
+    # попадает в статистику и удваивает нагрузку, а повторы уже выполняет
+    # resilient_get по RetryPolicy, поэтому встроенный повтор отключаем.
+    if hasattr(session, "_retry_connection"):
+        session._retry_connection = False  # pylint: disable=protected-access
+    return session
 
-    def _on_completion(f):
-        todo.remove(f)
-        done.put_nowait(f)
-        loop.create_task(_add_next())
 
-    async def _wait_for_one():
-        f = await done.get()
-        return f.result()
+async def _read_body(
+    res: aiohttp.ClientResponse, body_mode: BodyMode, max_body_size: int
+) -> tuple[int, int | None] | None:
+    """Читает тело ответа частями, не храня его целиком в памяти.
 
-    async def _add_next():
-        try:
-            f = await anext(fs_async_gen)
-        except StopAsyncIteration:
-            return
-        f = ensure_future(f, loop=loop)
-        f.add_done_callback(_on_completion)
-        todo.add(f)
+    Args:
+        res: Ответ aiohttp.
+        body_mode: Режим DISCARD или CHECKSUM.
+        max_body_size: Наибольший допустимый размер тела в байтах.
 
-    for _ in range(concurrency):
-        loop.run_until_complete(_add_next())
-    while todo:
-        yield _wait_for_one()
+    Returns:
+        Пара (количество прочитанных байт, CRC32 тела или None в режиме
+        DISCARD) или None, если тело больше max_body_size.
+    """
+    if res.content_length is not None and res.content_length > max_body_size:
+        return None
+    size = 0
+    checksum = 0 if body_mode is BodyMode.CHECKSUM else None
+    async for chunk in res.content.iter_chunked(BODY_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_body_size:
+            return None
+        if checksum is not None:
+            checksum = zlib.crc32(chunk, checksum)
+    return size, checksum
 
 
-async def do_get(session: aiohttp.ClientSession, url: str, _):
-    """Выполняет GET-запрос по указанному DELAY_URL с использованием
+async def do_get(
+    session: aiohttp.ClientSession,
+    url: str,
+    body_mode: BodyMode = BodyMode.STATUS_ONLY,
+    max_body_size: int = MAX_BODY_SIZE,
+    stats: LoadStats | None = None,
+):
+    """Выполняет GET-запрос по указанному URL с использованием
     aiohttp.ClientSession и возвращает код ответа.
 
+    В режиме STATUS_ONLY ответ освобождается сразу после получения кода, в
+    режимах DISCARD и CHECKSUM тело сначала дочитывается частями. В обоих
+    случаях в режиме POOLED соединение возвращается в пул. Если тело больше
+    max_body_size, соединение закрывается, не дочитывая его.
+
     Args:
         session: Сессия aiohttp.ClientSession для выполнения запроса.
-        url: DELAY_URL для запроса.
-        _: Неиспользуемый параметр (необходим для совместимости с partial).
+        url: URL для запроса.
+        body_mode: Режим обработки тела ответа.
+        max_body_size: Наибольший допустимый размер тела в байтах.
+        stats: Статистика, в которую записываются объём и контрольная сумма
+            прочитанного тела.
 
     Returns:
-        Код ответа HTTP-запроса или сообщение об ошибке TimeoutError.
+        Код ответа HTTP-запроса или сообщение об ошибке TimeoutError,
+        ошибке соединения или слишком большом теле ответа.
     """
     try:
-        res = await session.get(url)
-        return res.status
+        async with session.get(url) as res:
+            if body_mode is BodyMode.STATUS_ONLY:
+                res.release()
+                return res.status
+            body = await _read_body(res, body_mode, max_body_size)
+            if body is None:
+                res.close()
+                return BODY_TOO_LARGE_MESSAGE
+            if stats is not None:
+                stats.record_body(*body)
+            return res.status
     except TimeoutError:
         return TIMEOUT_ERROR_MESSAGE
+    except aiohttp.ClientError:
+        return CONNECTION_ERROR_MESSAGE
+
+
+def _is_retryable(status) -> bool:
+    """Можно ли повторить запрос с таким результатом.
 
+    Повторяются тайм-ауты, ошибки соединения, 429 и ответы 5xx. Слишком
+    большое тело и остальные коды ответа при повторе не изменятся.
+    """
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return status in (TIMEOUT_ERROR_MESSAGE, CONNECTION_ERROR_MESSAGE)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Политика повторов с экспоненциальной паузой и случайным разбросом.
+
+    Пауза перед повтором n выбирается равномерно от 0 до
+    min(max_delay, base_delay * 2**(n - 1)), чтобы повторы многих клиентов
+    не приходили на сервер одновременно.
+
+    Attributes:
+        attempts: Наибольшее количество повторов после первой попытки.
+        base_delay: Пауза перед первым повтором в секундах.
+        max_delay: Наибольшая пауза перед повтором в секундах.
+    """
 
-async def fetch(url: str) -> list:
-    """Выполняет COUNT_OF_REQUESTS GET-запросов по указанному DELAY_URL с
-    ограничением параллелизма и возвращает список кодов ответов.
+    attempts: int = RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+
+    def backoff(self, retry: int) -> float:
+        """Возвращает паузу перед повтором с номером retry (от 1)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        # Случайность нужна только для разброса пауз.
+        return random.uniform(0, ceiling)  # nosec B311
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Политика дублирования медленных запросов.
+
+    Если запрос не ответил за время, которое не превышают percentile%
+    уже завершённых попыток, отправляется его дубликат. Результатом
+    считается первый успешный ответ, вторая попытка отменяется.
+
+    Attributes:
+        percentile: Процентиль задержки попыток, после которого
+            отправляется дубликат.
+        min_samples: Сколько задержек нужно накопить, прежде чем
+            пользоваться процентилем.
+        initial_delay: Пауза до дубликата, пока задержек накоплено меньше
+            min_samples, в секундах.
+    """
+
+    percentile: float = HEDGE_PERCENTILE
+    min_samples: int = HEDGE_MIN_SAMPLES
+    initial_delay: float = HEDGE_INITIAL_DELAY
+
+    def delay(self, attempt_latency: LatencyHistogram) -> float:
+        """Возвращает паузу до отправки дубликата в секундах.
+
+        Args:
+            attempt_latency: Гистограмма задержек завершённых попыток.
+        """
+        if attempt_latency.count < self.min_samples:
+            return self.initial_delay
+        return attempt_latency.percentile(self.percentile)
+
+
+async def _timed_get(
+    session: aiohttp.ClientSession,
+    url: str,
+    *,
+    body_mode: BodyMode,
+    max_body_size: int,
+    stats: LoadStats | None,
+    attempt_latency: LatencyHistogram,
+):
+    """Выполняет do_get и записывает задержку успешной попытки.
+
+    Задержки неудачных попыток не записываются, чтобы тайм-ауты не
+    сдвигали порог дублирования.
+    """
+    begin = time.perf_counter()
+    status = await do_get(session, url, body_mode, max_body_size, stats)
+    if not _is_retryable(status):
+        attempt_latency.record(time.perf_counter() - begin)
+    return status
+
+
+async def _hedged_get(
+    session: aiohttp.ClientSession,
+    url: str,
+    *,
+    body_mode: BodyMode,
+    max_body_size: int,
+    stats: LoadStats | None,
+    hedge_policy: HedgePolicy,
+    attempt_latency: LatencyHistogram,
+):
+    """Выполняет запрос и при необходимости его дубликат.
+
+    Returns:
+        Первый успешный результат двух попыток или результат последней
+        завершившейся попытки, если обе неудачны.
+    """
+    attempt = partial(
+        _timed_get,
+        session,
+        url,
+        body_mode=body_mode,
+        max_body_size=max_body_size,
+        stats=stats,
+        attempt_latency=attempt_latency,
+    )
+    primary = create_task(attempt())
+    pending = {primary}
+    try:
+        done, pending = await wait(pending, timeout=hedge_policy.delay(attempt_latency))
+        if done:
+            return primary.result()
+
+        hedge = create_task(attempt())
+        pending.add(hedge)
+        if stats is not None:
+            stats.hedges += 1
+        while pending:
+            done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+            # Успешная попытка важнее неудачной, при равенстве - основная
+            finished = [task for task in (primary, hedge) if task in done]
+            winner = next(
+                (task for task in finished if not _is_retryable(task.result())),
+                finished[0],
+            )
+            status = winner.result()
+            if not _is_retryable(status):
+                break
+    finally:
+        # Вторая попытка отменяется, в том числе при отмене самого запроса
+        for task in pending:
+            task.cancel()
+        await gather(*pending, return_exceptions=True)
+    if winner is hedge and not _is_retryable(status) and stats is not None:
+        stats.hedge_wins += 1
+    return status
+
+
+async def resilient_get(
+    session: aiohttp.ClientSession,
+    url: str,
+    *,
+    body_mode: BodyMode = BodyMode.STATUS_ONLY,
+    max_body_size: int = MAX_BODY_SIZE,
+    stats: LoadStats | None = None,
+    retry_policy: RetryPolicy | None = None,
+    hedge_policy: HedgePolicy | None = None,
+    attempt_latency: LatencyHistogram | None = None,
+):
+    """Выполняет do_get с повторами и дублированием медленных запросов.
+
+    Без политик равносилен do_get. Дубликаты и повторы учитываются в stats
+    отдельно от запросов, чтобы была видна дополнительная нагрузка на
+    сервер.
 
     Args:
-        url: DELAY_URL для запросов.
+        session: Сессия aiohttp.ClientSession для выполнения запроса.
+        url: URL для запроса.
+        body_mode: Режим обработки тела ответа.
+        max_body_size: Наибольший допустимый размер тела в байтах.
+        stats: Статистика, в которую записываются тела ответов, дубликаты
+            и повторы.
+        retry_policy: Политика повторов неудачных запросов.
+        hedge_policy: Политика дублирования медленных запросов.
+        attempt_latency: Гистограмма задержек попыток, общая для всех
+            запросов прогона. По ней выбирается порог дублирования.
 
     Returns:
-        Список кодов ответов HTTP-запросов.
+        Код ответа HTTP-запроса или сообщение об ошибке последней попытки.
     """
-    async with aiohttp.ClientSession(
-        connector=aiohttp.TCPConnector(
-            limit=0,
-            ssl=False,
-            use_dns_cache=False,
-            force_close=True,
-        ),
-        timeout=aiohttp.ClientTimeout(total=10),
+    if attempt_latency is None:
+        attempt_latency = LatencyHistogram()
+    retries = retry_policy.attempts if retry_policy is not None else 0
+    for retry in range(retries + 1):
+        if retry:
+            if stats is not None:
+                stats.retries += 1
+            await sleep(retry_policy.backoff(retry))
+        if hedge_policy is None:
+            status = await do_get(session, url, body_mode, max_body_size, stats)
+        else:
+            status = await _hedged_get(
+                session,
+                url,
+                body_mode=body_mode,
+                max_body_size=max_body_size,
+                stats=stats,
+                hedge_policy=hedge_policy,
+                attempt_latency=attempt_latency,
+            )
+        if not _is_retryable(status):
+            break
+    return status
+
+
+async def _recorded_get(stats: LoadStats, get: Callable[[str], Awaitable], url: str):
+    """Выполняет get(url) и записывает его результат и задержку в stats.
+
+    Returns:
+        Код ответа HTTP-запроса или сообщение об ошибке TimeoutError.
+    """
+    begin = time.perf_counter()
+    status = await get(url)
+    finished_at = time.perf_counter()
+    stats.record(status, finished_at - begin, finished_at)
+    return status
+
+
+async def fetch(
+    urls: str | Sequence[str] = DELAY_URL,
+    count: int = COUNT_OF_REQUESTS,
+    concurrency: int = CONCURRENCY,
+    *,
+    timeout: float = TIMEOUT,
+    connection_mode: ConnectionMode = ConnectionMode.FRESH,
+    connection_limit: int = CONNECTION_LIMIT,
+    connection_limit_per_host: int = CONNECTION_LIMIT_PER_HOST,
+    body_mode: BodyMode = BodyMode.STATUS_ONLY,
+    max_body_size: int = MAX_BODY_SIZE,
+    retry_policy: RetryPolicy | None = None,
+    hedge_policy: HedgePolicy | None = None,
+    stats: LoadStats | None = None,
+) -> list:
+    """Выполняет count GET-запросов по указанным URL с ограничением
+    параллелизма и возвращает список кодов ответов.
+
+    Args:
+        urls: URL или последовательность URL, которые запрашиваются по кругу.
+        count: Количество запросов.
+        concurrency: Максимальное количество одновременных запросов.
+        timeout: Общий тайм-аут одного запроса в секундах.
+        connection_mode: Режим работы с соединениями.
+        connection_limit: Общее ограничение на количество соединений в
+            режиме POOLED.
+        connection_limit_per_host: Ограничение на количество соединений с
+            одним хостом в режиме POOLED.
+        body_mode: Режим обработки тела ответа.
+        max_body_size: Наибольший допустимый размер тела в байтах.
+        retry_policy: Политика повторов неудачных запросов.
+        hedge_policy: Политика дублирования медленных запросов.
+        stats: Статистика, в которую записываются задержка и результат
+            каждого запроса.
+
+    Returns:
+        Список кодов ответов HTTP-запросов в порядке завершения.
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+    async with make_session(
+        connection_mode, timeout, connection_limit, connection_limit_per_host
     ) as session:
-        async_gen = make_async_gen(partial(do_get, session, url), COUNT_OF_REQUESTS)
-        responses = [
-            await f for f in as_completed_for_async_gen(async_gen, CONCURRENCY)
+        job = partial(
+            resilient_get,
+            session,
+            body_mode=body_mode,
+            max_body_size=max_body_size,
+            stats=stats,
+            retry_policy=retry_policy,
+            hedge_policy=hedge_policy,
+            attempt_latency=LatencyHistogram(),
+        )
+        if stats is not None:
+            job = partial(_recorded_get, stats, job)
+        return [
+            response
+            async for response in as_completed_pool(
+                job, islice(cycle(urls), count), min(concurrency, count)
+            )
         ]
-        return responses
 
 
-def process_result(result: list) -> dict:
+@dataclass
+class DispatchReport:
+    """Результат прогона с постоянной интенсивностью запросов.
+
+    Attributes:
+        scheduled: Сколько запросов было запланировано.
+        dispatched: Сколько запросов было отправлено.
+        late: Сколько запросов отправлено позже расписания больше чем на
+            late_threshold.
+        missed: Сколько запросов не отправлено из-за ограничения
+            max_in_flight.
+        max_lag: Наибольшее опоздание отправки в секундах.
+        stats: Статистика запросов; задержка считается от запланированного
+            времени отправки.
+    """
+
+    scheduled: int = 0
+    dispatched: int = 0
+    late: int = 0
+    missed: int = 0
+    max_lag: float = 0.0
+    stats: LoadStats = field(default_factory=LoadStats)
+
+
+def _scheduled_offset(index: int, rate: float, ramp_up: float) -> float:
+    """Вычисляет время отправки запроса index от начала прогона.
+
+    Во время разгона интенсивность линейно растёт от 0 до rate, поэтому
+    число запросов к моменту t равно rate * t**2 / (2 * ramp_up).
+
+    Args:
+        index: Номер запроса.
+        rate: Целевая интенсивность, запросов в секунду.
+        ramp_up: Длительность разгона в секундах.
+
+    Returns:
+        Смещение от начала прогона в секундах.
+    """
+    ramp_up_requests = rate * ramp_up / 2
+    if index < ramp_up_requests:
+        return math.sqrt(2 * ramp_up * index / rate)
+    return ramp_up + (index - ramp_up_requests) / rate
+
+
+async def fetch_open_loop(
+    urls: str | Sequence[str] = DELAY_URL,
+    rate: float = COUNT_OF_REQUESTS,
+    duration: float = 1.0,
+    *,
+    ramp_up: float = 0.0,
+    timeout: float = TIMEOUT,
+    connection_mode: ConnectionMode = ConnectionMode.FRESH,
+    max_in_flight: int | None = None,
+    late_threshold: float = LATE_DISPATCH_THRESHOLD,
+    body_mode: BodyMode = BodyMode.STATUS_ONLY,
+    max_body_size: int = MAX_BODY_SIZE,
+    retry_policy: RetryPolicy | None = None,
+    hedge_policy: HedgePolicy | None = None,
+    stats: LoadStats | None = None,
+) -> DispatchReport:
+    """Отправляет запросы по расписанию с постоянной интенсивностью.
+
+    В отличие от fetch (закрытая модель, новый запрос после завершения
+    предыдущего), запросы отправляются по расписанию независимо от того,
+    успел ли ответить сервер. Так замедление сервера не снижает нагрузку и
+    не прячется в результатах: задержка считается от запланированного
+    времени отправки, а отстающие от расписания отправки учитываются
+    отдельно.
+
+    Args:
+        urls: URL или последовательность URL, которые запрашиваются по кругу.
+        rate: Целевая интенсивность, запросов в секунду.
+        duration: Длительность прогона в секундах, включая разгон.
+        ramp_up: Длительность линейного разгона до rate в секундах.
+        timeout: Общий тайм-аут одного запроса в секундах.
+        connection_mode: Режим работы с соединениями.
+        max_in_flight: Наибольшее количество одновременных запросов. Запросы
+            сверх него не отправляются и считаются пропущенными.
+        late_threshold: Допустимое опоздание отправки в секундах.
+        body_mode: Режим обработки тела ответа.
+        max_body_size: Наибольший допустимый размер тела в байтах.
+        retry_policy: Политика повторов неудачных запросов.
+        hedge_policy: Политика дублирования медленных запросов.
+        stats: Статистика, в которую записываются результаты запросов.
+
+    Returns:
+        Отчёт о расписании отправок и статистика запросов.
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+    ramp_up = min(ramp_up, duration)
+    report = DispatchReport(stats=stats if stats is not None else LoadStats())
+    report.scheduled = math.floor(rate * ramp_up / 2 + rate * (duration - ramp_up))
+    loop = get_running_loop()
+    in_flight: set[Task] = set()
+    attempt_latency = LatencyHistogram()
+
+    async def _scheduled_get(session: aiohttp.ClientSession, url: str, due: float):
+        status = await resilient_get(
+            session,
+            url,
+            body_mode=body_mode,
+            max_body_size=max_body_size,
+            stats=report.stats,
+            retry_policy=retry_policy,
+            hedge_policy=hedge_policy,
+            attempt_latency=attempt_latency,
+        )
+        finished = loop.time()
+        report.stats.record(status, finished - due, time.perf_counter())
+
+    async with make_session(connection_mode, timeout, connection_limit=0) as session:
+        started_at = loop.time()
+        url_iterator = cycle(urls)
+        for index in range(report.scheduled):
+            url = next(url_iterator)
+            due = started_at + _scheduled_offset(index, rate, ramp_up)
+            if (delay := due - loop.time()) > 0:
+                await sleep(delay)
+            if max_in_flight is not None and len(in_flight) >= max_in_flight:
+                report.missed += 1
+                continue
+            lag = loop.time() - due
+            report.max_lag = max(report.max_lag, lag)
+            if lag > late_threshold:
+                report.late += 1
+            task = create_task(_scheduled_get(session, url, due))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            report.dispatched += 1
+        await gather(*in_flight)
+    return report
+
+
+def benchmark_connection_modes(
+    url: str = DELAY_URL,
+    count: int = COUNT_OF_REQUESTS,
+    concurrency: int = CONCURRENCY,
+) -> dict[str, dict]:
+    """Сравнивает режимы FRESH и POOLED на одной и той же цели.
+
+    Args:
+        url: URL для запросов.
+        count: Количество запросов в каждом режиме.
+        concurrency: Максимальное количество одновременных запросов.
+
+    Returns:
+        Словарь режим -> запросов в секунду, характеристики задержек и
+        количество ошибок.
+    """
+    results = {}
+    for connection_mode in ConnectionMode:
+        stats = LoadStats()
+        begin = time.perf_counter()
+        run(
+            fetch(url, count, concurrency, connection_mode=connection_mode, stats=stats)
+        )
+        total_time = time.perf_counter() - begin
+        latency = stats.latency.summary()
+        errors = sum(
+            status_count
+            for status, status_count in stats.status_counts.items()
+            if stats.is_error(status)
+        )
+        results[connection_mode.value] = {
+            "requests_per_second": count / total_time,
+            "latency": latency,
+            "errors": errors,
+        }
+        logger.info(
+            f"Режим {connection_mode}: {count / total_time:.1f} запросов/сек, "
+            f"средняя задержка {latency['mean'] * 1000:.1f} мс, "
+            f"p50 {latency['p50'] * 1000:.1f} мс, "
+            f"p99 {latency['p99'] * 1000:.1f} мс, "
+            f"ошибок: {errors}"
+        )
+    return results
+
+
+def benchmark_offline(
+    concurrency_levels: Iterable[int] = (10, 100, 1000),
+    count: int = 1000,
+    delay: float = 0.1,
+    connection_mode: ConnectionMode = ConnectionMode.FRESH,
+    server_config: DelayServerConfig | None = None,
+) -> dict[int, dict]:
+    """Замеряет fetch на локальном сервере задержек при разном параллелизме.
+
+    Сервер запускается в этом же процессе (в отдельном потоке), поэтому
+    результаты воспроизводимы без доступа в интернет.
+
+    Args:
+        concurrency_levels: Уровни параллелизма для замеров.
+        count: Количество запросов на каждом уровне.
+        delay: Задержка ответа сервера в секундах.
+        connection_mode: Режим работы с соединениями.
+        server_config: Параметры поведения сервера (разброс, ошибки и т.д.).
+
+    Returns:
+        Словарь параллелизм -> время, запросов в секунду и отчёт LoadStats.
+    """
+    results = {}
+    with delay_server_in_thread(server_config) as base_url:
+        url = f"{base_url}/delay/{delay}"
+        for concurrency in concurrency_levels:
+            stats = LoadStats()
+            begin = time.perf_counter()
+            run(
+                fetch(
+                    url,
+                    count,
+                    concurrency,
+                    connection_mode=connection_mode,
+                    stats=stats,
+                )
+            )
+            total_time = time.perf_counter() - begin
+            results[concurrency] = {
+                "total_time": total_time,
+                "requests_per_second": count / total_time,
+                **stats.report(),
+            }
+            latency = stats.latency.summary()
+            logger.info(
+                f"Параллелизм {concurrency}: {total_time:.2f} сек, "
+                f"{count / total_time:.1f} запросов/сек, "
+                f"p50 {latency['p50'] * 1000:.1f} мс, "
+                f"p99 {latency['p99'] * 1000:.1f} мс, "
+                f"коды ответов: {dict(stats.status_counts)}"
+            )
+    return results
+
+
+def _split_evenly(total: int, parts: int) -> list[int]:
+    """Делит total на parts почти равных целых частей."""
+    quotient, remainder = divmod(total, parts)
+    return [quotient + (index < remainder) for index in range(parts)]
+
+
+async def _stream_worker_load(
+    results: multiprocessing.Queue,
+    urls: str | Sequence[str],
+    count: int,
+    concurrency: int,
+    *,
+    report_interval: float,
+    fetch_options: dict,
+):
+    """Выполняет fetch в процессе-обработчике и периодически отправляет
+    родителю порции статистики."""
+    stats = LoadStats()
+
+    async def _report_periodically():
+        while True:
+            await sleep(report_interval)
+            results.put(("stats", stats.pop_delta()))
+
+    reporter = create_task(_report_periodically())
+    try:
+        await fetch(urls, count, concurrency, stats=stats, **fetch_options)
+    finally:
+        reporter.cancel()
+        results.put(("stats", stats.pop_delta()))
+
+
+def _load_worker(
+    results: multiprocessing.Queue,
+    urls: str | Sequence[str],
+    count: int,
+    concurrency: int,
+    *,
+    report_interval: float,
+    fetch_options: dict,
+):
+    """Точка входа процесса-обработчика: свой цикл событий и пул соединений."""
+    try:
+        run(
+            _stream_worker_load(
+                results,
+                urls,
+                count,
+                concurrency,
+                report_interval=report_interval,
+                fetch_options=fetch_options,
+            )
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        results.put(("error", repr(error)))
+    else:
+        results.put(("done", None))
+
+
+def fetch_multiprocess(
+    urls: str | Sequence[str] = DELAY_URL,
+    count: int = COUNT_OF_REQUESTS,
+    concurrency: int = CONCURRENCY,
+    workers: int | None = None,
+    report_interval: float = REPORT_INTERVAL,
+    **fetch_options,
+) -> LoadStats:
+    """Распределяет запросы между несколькими процессами.
+
+    Каждый процесс запускает свой цикл событий и пул соединений, выполняя
+    свою долю запросов и параллелизма через fetch. Порции статистики
+    передаются родителю каждые report_interval секунд и объединяются.
+    Посекундная шкала процессов складывается по номеру секунды от начала
+    работы каждого процесса.
+
+    Args:
+        urls: URL или последовательность URL, которые запрашиваются по кругу.
+        count: Общее количество запросов.
+        concurrency: Общее максимальное количество одновременных запросов.
+        workers: Количество процессов. По умолчанию - количество ядер.
+        report_interval: Как часто процессы отправляют статистику, в
+            секундах.
+        **fetch_options: Остальные аргументы fetch (timeout,
+            connection_mode и т.д.).
+
+    Returns:
+        Объединённая статистика всех процессов. Коды ответов в формате
+        process_result можно получить вызовом
+        process_result(stats.status_counts, count).
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, count, concurrency))
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_load_worker,
+            args=(results, urls, worker_count, worker_concurrency),
+            kwargs={"report_interval": report_interval, "fetch_options": fetch_options},
+        )
+        for worker_count, worker_concurrency in zip(
+            _split_evenly(count, workers), _split_evenly(concurrency, workers)
+        )
+    ]
+    for process in processes:
+        process.start()
+
+    stats = LoadStats()
+    finished = 0
+    while finished < len(processes):
+        try:
+            kind, payload = results.get(timeout=report_interval)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                logger.error("Процессы нагрузки завершились, не отправив результат.")
+                break
+            continue
+        if kind == "stats":
+            stats.merge(LoadStats.from_dict(payload))
+        else:
+            finished += 1
+            if kind == "error":
+                logger.error(f"Ошибка в процессе нагрузки: {payload}")
+    for process in processes:
+        process.join()
+    return stats
+
+
+def process_result(
+    result: list | Counter, count_of_requests: int = COUNT_OF_REQUESTS
+) -> dict:
     """Обрабатывает список результатов запросов, добавляя информацию о
     пропущенных (из-за тайм-аута) запросах и формирует словарь с количеством
     полученных кодов ответов.
 
     Args:
-        result: Список результатов запросов.
+        result: Список результатов запросов или уже посчитанные коды ответов
+            (например, LoadStats.status_counts).
+        count_of_requests: Сколько запросов было отправлено.
 
     Returns:
         Словарь, где ключи - коды ответов, а значения - количество их
         появлений в результатах.
     """
-    if (final_request_count := len(result)) != COUNT_OF_REQUESTS:
-        for _ in range(COUNT_OF_REQUESTS - final_request_count):
-            result.append(TIMEOUT_ERROR_MESSAGE)
-    structured_result = {}
-    for status in result:
-        if status not in structured_result:
-            structured_result[status] = 0
-        structured_result[status] += 1
-    return structured_result
+    structured_result = Counter(result)
+    if (missing := count_of_requests - structured_result.total()) > 0:
+        structured_result[TIMEOUT_ERROR_MESSAGE] += missing
+    return dict(structured_result)
 
 
 def task_d():
     """Основная функция задачи D."""
     begin = time.perf_counter()
     logger.info("Начинаю отправлять запросы...")
-    result = run(fetch(DELAY_URL))
+    stats = LoadStats()
+    result = run(fetch(DELAY_URL, stats=stats))
     total_time = time.perf_counter() - begin
     structured_result = process_result(result)
     logger.info(f"Результат отправки запросов: {structured_result}")
+    logger.info(f"Задержки запросов: {stats.latency.summary()}")
     logger.info(f"Время выполнения: {total_time:.2f}")
 
 
@@ -6,17 +6,1006 @@
 все палиндромы через запятую.
 """
 
+import base64
+import hashlib
+import heapq
+import json
+import os
 import re
+import sys
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from itertools import accumulate
 from logging import Logger
-from typing import List, Optional
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 from pydantic import StrictStr
 
 from logger.logger import create_logger
+from tasks.task_c import iter_batches, iter_parallel_map
 from tasks.task_f import class_time_decorator
 
 logger = create_logger(__name__)
 
+WORD_REGEX = re.compile(r"\w+")
+# Сколько символов читать из файла за раз
+READ_CHUNK_SIZE = 1 << 20
+# Сколько документов корпуса отправлять в процесс пула за раз
+CORPUS_BATCH_SIZE = 1_000
+# Частые слова: сколько возвращать и сколько слов отслеживать в
+# приближённом режиме
+TOP_K = 10
+SPACE_SAVING_CAPACITY = 10_000
+# Кэш результатов анализа: ограничения и расширение файлов записей на диске
+CACHE_MAX_ENTRIES = 1_024
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_FILE_SUFFIX = ".json"
+# Байт на количество слова при оценке размера записи без сериализации
+CACHE_COUNT_SIZE_ESTIMATE = 8
+# Версия формата записей кэша. Входит в ключ, поэтому записи старого формата
+# не читаются, а удаляются
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_REGEX = re.compile(r"v(\d+)-[0-9a-f]{32}\.json")
+
+
+class WordIndex(Sequence):
+    """Последовательность слов текста с общим словарём и обратным индексом.
+
+    Каждое различное слово хранится один раз и получает номер в порядке
+    первого появления, а сам текст хранится как массив номеров. Обратный
+    индекс (позиции каждого слова) строится один раз при первом запросе
+    позиций или количества и хранится сплошными массивами: позиции всех
+    слов подряд и смещения начала позиций каждого слова.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        """Инициализирует экземпляр класса WordIndex.
+
+        Args:
+            words: Начальные слова.
+        """
+        self.vocabulary: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.token_ids = array("I")
+        self._offsets: Optional[array] = None
+        self._positions: Optional[array] = None
+        self._frozen = False
+        for word in words:
+            self.append(word)
+
+    @classmethod
+    def from_token_ids(cls, vocabulary: List[str], token_ids: array) -> "WordIndex":
+        """Создаёт индекс из готового словаря и массива номеров слов.
+
+        Args:
+            vocabulary: Различные слова в порядке первого появления.
+            token_ids: Номера слов текста в словаре.
+
+        Returns:
+            Индекс слов.
+
+        Raises:
+            ValueError: Если номер слова выходит за пределы словаря.
+        """
+        if token_ids and max(token_ids) >= len(vocabulary):
+            raise ValueError("Token id is out of vocabulary.")
+        index = cls()
+        index.vocabulary = vocabulary
+        index.ids = {word: word_id for word_id, word in enumerate(vocabulary)}
+        index.token_ids = token_ids
+        return index
+
+    def freeze(self) -> "WordIndex":
+        """Запрещает добавлять слова, чтобы индекс можно было разделять.
+
+        Returns:
+            Этот же индекс.
+        """
+        self._frozen = True
+        return self
+
+    def append(self, word: str) -> int:
+        """Добавляет слово в конец текста.
+
+        Args:
+            word: Слово.
+
+        Returns:
+            Номер слова в словаре.
+        """
+        if self._frozen:
+            raise TypeError("WordIndex is frozen.")
+        word_id = self.ids.get(word)
+        if word_id is None:
+            word_id = self.ids[word] = len(self.vocabulary)
+            self.vocabulary.append(word)
+        self.token_ids.append(word_id)
+        self._offsets = self._positions = None
+        return word_id
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.vocabulary[word_id] for word_id in self.token_ids[index]]
+        return self.vocabulary[self.token_ids[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.vocabulary.__getitem__, self.token_ids)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WordIndex):
+            return NotImplemented
+        return self.vocabulary == other.vocabulary and self.token_ids == other.token_ids
+
+    def _build_index(self):
+        """Строит обратный индекс сортировкой подсчётом по номерам слов."""
+        counts = Counter(self.token_ids)
+        offsets = array("I", [0])
+        offsets.extend(
+            accumulate(counts[word_id] for word_id in range(len(self.vocabulary)))
+        )
+        positions = array("I", [0]) * len(self.token_ids)
+        cursors = offsets[:-1]
+        for position, word_id in enumerate(self.token_ids):
+            positions[cursors[word_id]] = position
+            cursors[word_id] += 1
+        self._offsets, self._positions = offsets, positions
+
+    def __contains__(self, value) -> bool:
+        return isinstance(value, str) and value in self.ids
+
+    def count(self, value) -> int:
+        """Возвращает количество вхождений слова за O(1) после построения
+        индекса."""
+        word_id = self.ids.get(value) if isinstance(value, str) else None
+        if word_id is None:
+            return 0
+        if self._offsets is None:
+            self._build_index()
+        return self._offsets[word_id + 1] - self._offsets[word_id]
+
+    def positions(self, word: str) -> array:
+        """Возвращает позиции слова в тексте по возрастанию.
+
+        Args:
+            word: Слово.
+
+        Returns:
+            Массив номеров позиций; пустой, если слова нет в тексте.
+        """
+        word_id = self.ids.get(word)
+        if word_id is None:
+            return array("I")
+        if self._offsets is None:
+            self._build_index()
+        return self._positions[self._offsets[word_id] : self._offsets[word_id + 1]]
+
+
+@dataclass(frozen=True)
+class TextAnalysis:
+    """Результат анализа текста за один проход.
+
+    Attributes:
+        words: Слова текста в нижнем регистре в порядке появления. Пустой
+            индекс, если слова не сохранялись.
+        word_counts: Количество каждого слова в порядке первого появления.
+        longest_word: Первое из самых длинных слов.
+        most_frequent_word: Первое из самых частых слов.
+        count_of_special_chars: Количество символов вне слов, то есть не
+            букв, не цифр и не подчёркиваний.
+        palindromes: Различные палиндромы в порядке первого появления
+            (количество каждого есть в word_counts).
+    """
+
+    words: WordIndex
+    word_counts: Mapping[str, int]
+    longest_word: Optional[str]
+    most_frequent_word: Optional[str]
+    count_of_special_chars: int
+    palindromes: Tuple[str, ...]
+
+
+def iter_file_chunks(
+    path: str | os.PathLike,
+    encoding: str = "utf-8",
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> Iterator[str]:
+    """Читает текстовый файл буферизованно по chunk_size символов.
+
+    Переводы строк не преобразуются, поэтому \\r\\n остаётся двумя
+    символами, как в исходном файле.
+
+    Args:
+        path: Путь к текстовому файлу.
+        encoding: Кодировка файла.
+        chunk_size: Сколько символов читать за раз.
+
+    Yields:
+        Части текста файла.
+    """
+    with open(path, encoding=encoding, newline="") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def _word_tail_start(text: str) -> int:
+    """Находит начало последовательности символов слова в конце текста.
+
+    Символы слова - те же, что у \\w: буквы, цифры и подчёркивание.
+
+    Returns:
+        Позиция начала последовательности или len(text), если текст
+        заканчивается не символом слова.
+    """
+    start = len(text)
+    while start and (text[start - 1].isalnum() or text[start - 1] == "_"):
+        start -= 1
+    return start
+
+
+class _ChunkTokenizer:
+    """Делит текст, поступающий частями, на последовательности символов
+    слова.
+
+    Последовательность в конце части может продолжиться в следующей части,
+    поэтому она откладывается до следующего вызова split.
+    """
+
+    def __init__(self):
+        """Инициализирует экземпляр класса _ChunkTokenizer."""
+        self.tail = ""
+
+    def split(self, chunk: str, final: bool = False) -> Tuple[Iterator[str], int]:
+        """Выделяет законченные последовательности символов слова.
+
+        Args:
+            chunk: Часть текста.
+            final: Последняя ли это часть. Тогда ничего не откладывается.
+
+        Returns:
+            Итератор последовательностей символов слова и количество
+            обработанных символов (отложенный хвост в них не входит).
+        """
+        text = self.tail + chunk if self.tail else chunk
+        end = len(text) if final else _word_tail_start(text)
+        self.tail = text[end:]
+        return map(re.Match.group, WORD_REGEX.finditer(text, 0, end)), end
+
+
+def _iter_token_words(tokens: Iterable[str]) -> Iterator[str]:
+    """Отбирает из последовательностей символов слова слова: содержащие
+    хотя бы одну букву, в нижнем регистре."""
+    for token in tokens:
+        if any(map(str.isalpha, token)):
+            yield token.lower()
+
+
+def iter_words(chunks: Iterable[str]) -> Iterator[str]:
+    """Выделяет слова из текста, поступающего частями.
+
+    Слова выделяются тем же _ChunkTokenizer, что и в StreamingTextAnalyzer,
+    в том числе на границах частей, но ничего не накапливается.
+
+    Args:
+        chunks: Части текста.
+
+    Yields:
+        Слова в нижнем регистре в порядке появления.
+    """
+    tokenizer = _ChunkTokenizer()
+    for chunk in chunks:
+        yield from _iter_token_words(tokenizer.split(chunk)[0])
+    yield from _iter_token_words(tokenizer.split("", final=True)[0])
+
+
+@dataclass(frozen=True)
+class TopWord:
+    """Частое слово и его количество.
+
+    Attributes:
+        word: Слово.
+        count: Количество вхождений (в приближённом режиме - оценка
+            сверху).
+        error: Наибольшая ошибка оценки: настоящее количество лежит в
+            отрезке [count - error, count]. В точном режиме 0.
+    """
+
+    word: str
+    count: int
+    error: int = 0
+
+
+def top_k_words(word_counts: Mapping[str, int], k: int = TOP_K) -> List[TopWord]:
+    """Находит k самых частых слов по точному словарю количеств.
+
+    heapq.nlargest устойчив, поэтому слова с равным количеством идут в
+    порядке первого появления, как у max в find_most_frequent_word.
+
+    Args:
+        word_counts: Количество каждого слова в порядке первого появления.
+        k: Сколько слов вернуть.
+
+    Returns:
+        Самые частые слова по убыванию количества.
+    """
+    return [
+        TopWord(word, count)
+        for word, count in heapq.nlargest(k, word_counts.items(), key=itemgetter(1))
+    ]
+
+
+class SpaceSavingCounter:
+    """Приближённый подсчёт частых слов алгоритмом Space-Saving.
+
+    Хранится не больше capacity слов. Новое слово при заполненной таблице
+    вытесняет слово с наименьшим количеством и наследует его количество как
+    ошибку. Количество каждого слова завышено не больше чем на его ошибку,
+    а любое слово, встретившееся больше total / capacity раз, гарантированно
+    есть в таблице.
+    """
+
+    def __init__(self, capacity: int = SPACE_SAVING_CAPACITY):
+        """Инициализирует экземпляр класса SpaceSavingCounter.
+
+        Args:
+            capacity: Наибольшее количество отслеживаемых слов.
+
+        Raises:
+            ValueError: Если capacity меньше 1.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be positive.")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._first_seen: Dict[str, int] = {}
+        self._sequence = 0
+        # Куча (количество, порядок появления, слово). Количества в куче
+        # могут отставать от counts и обновляются при извлечении.
+        self._heap: List[Tuple[int, int, str]] = []
+
+    def _evict(self) -> int:
+        """Вытесняет слово с наименьшим количеством.
+
+        Returns:
+            Количество вытесненного слова.
+        """
+        while True:
+            count, _, word = heapq.heappop(self._heap)
+            if self.counts[word] == count:
+                break
+            entry = (self.counts[word], self._first_seen[word], word)
+            heapq.heappush(self._heap, entry)
+        del self.counts[word], self.errors[word], self._first_seen[word]
+        return count
+
+    def add(self, word: str, count: int = 1):
+        """Учитывает count вхождений слова.
+
+        Args:
+            word: Слово.
+            count: Количество вхождений.
+        """
+        self.total += count
+        if word in self.counts:
+            self.counts[word] += count
+            return
+        error = self._evict() if len(self.counts) >= self.capacity else 0
+        self._sequence += 1
+        self.counts[word] = error + count
+        self.errors[word] = error
+        self._first_seen[word] = self._sequence
+        heapq.heappush(self._heap, (error + count, self._sequence, word))
+
+    def update(self, words: Iterable[str]):
+        """Учитывает по одному вхождению каждого слова."""
+        for word in words:
+            self.add(word)
+
+    @property
+    def error_bound(self) -> int:
+        """Наибольшая возможная ошибка количества любого слова."""
+        return max(self.errors.values(), default=0)
+
+    def top_k(self, k: int = TOP_K) -> List[TopWord]:
+        """Возвращает k слов с наибольшими оценками количества.
+
+        Слова с равной оценкой идут в порядке появления в таблице.
+
+        Args:
+            k: Сколько слов вернуть.
+
+        Returns:
+            Слова по убыванию оценки количества с границами ошибки.
+        """
+        words = heapq.nsmallest(
+            k,
+            self.counts,
+            key=lambda word: (-self.counts[word], self._first_seen[word]),
+        )
+        return [TopWord(word, self.counts[word], self.errors[word]) for word in words]
+
+
+def approximate_top_k_words(
+    chunks: Iterable[str],
+    k: int = TOP_K,
+    capacity: int = SPACE_SAVING_CAPACITY,
+) -> List[TopWord]:
+    """Находит частые слова текста, поступающего частями, с памятью,
+    ограниченной capacity слов.
+
+    Имеет смысл для потоков, чей словарь не помещается в память. Если
+    текст уже целиком в памяти, точный top_k_words не дороже.
+
+    Args:
+        chunks: Части текста.
+        k: Сколько слов вернуть.
+        capacity: Наибольшее количество отслеживаемых слов.
+
+    Returns:
+        Слова по убыванию оценки количества с границами ошибки.
+    """
+    counter = SpaceSavingCounter(capacity)
+    counter.update(iter_words(chunks))
+    return counter.top_k(k)
+
+
+def approximate_top_k_file(
+    path: str | os.PathLike,
+    k: int = TOP_K,
+    capacity: int = SPACE_SAVING_CAPACITY,
+    encoding: str = "utf-8",
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> List[TopWord]:
+    """Находит частые слова файла с памятью, ограниченной capacity слов.
+
+    Args:
+        path: Путь к текстовому файлу.
+        k: Сколько слов вернуть.
+        capacity: Наибольшее количество отслеживаемых слов.
+        encoding: Кодировка файла.
+        chunk_size: Сколько символов читать за раз.
+
+    Returns:
+        Слова по убыванию оценки количества с границами ошибки.
+    """
+    return approximate_top_k_words(
+        iter_file_chunks(path, encoding, chunk_size), k, capacity
+    )
+
+
+def _most_frequent_word(word_counts: Mapping[str, int]) -> Optional[str]:
+    """Возвращает первое по порядку появления из самых частых слов."""
+    if not word_counts:
+        return None
+    return max(word_counts, key=word_counts.__getitem__)
+
+
+class StreamingTextAnalyzer:
+    """Потоковый анализ текста, поступающего частями.
+
+    Текст передаётся частями через feed, результат возвращает finalize.
+    Последовательность символов слова в конце части откладывается до
+    следующей части, поэтому слова, разрезанные границей частей, и
+    спецсимволы считаются так же, как в цельном тексте. Без keep_words
+    память зависит только от размера словаря, а не от длины текста.
+    """
+
+    def __init__(self, keep_words: bool = False):
+        """Инициализирует экземпляр класса StreamingTextAnalyzer.
+
+        Args:
+            keep_words: Сохранять ли все слова в порядке появления.
+        """
+        self.keep_words = keep_words
+        self.words = WordIndex()
+        self.word_counts: Dict[str, int] = {}
+        self.palindromes: List[str] = []
+        self.longest_word: Optional[str] = None
+        self.char_count = 0
+        self.word_char_count = 0
+        self._tokenizer = _ChunkTokenizer()
+
+    def feed(self, chunk: str, final: bool = False):
+        """Добавляет очередную часть текста.
+
+        Пустая часть без final ничего не меняет.
+
+        Args:
+            chunk: Часть текста.
+            final: Последняя ли это часть. Тогда слово в конце части не
+                откладывается.
+        """
+        if not chunk and not final:
+            return
+        tokens, end = self._tokenizer.split(chunk, final)
+        self.char_count += end
+        longest_length = len(self.longest_word) if self.longest_word else 0
+        word_counts = self.word_counts
+        words = self.words if self.keep_words else None
+        for token in tokens:
+            self.word_char_count += len(token)
+            if not any(map(str.isalpha, token)):
+                continue
+            word = token.lower()
+            if word in word_counts:
+                word_counts[word] += 1
+            else:
+                # Палиндромность и длина проверяются один раз для слова
+                word_counts[word] = 1
+                if word == word[::-1]:
+                    self.palindromes.append(word)
+                if len(word) > longest_length:
+                    self.longest_word, longest_length = word, len(word)
+            if words is not None:
+                words.append(word)
+
+    def feed_file(
+        self,
+        path: str | os.PathLike,
+        encoding: str = "utf-8",
+        chunk_size: int = READ_CHUNK_SIZE,
+    ):
+        """Добавляет текст файла, читая его через iter_file_chunks.
+
+        Args:
+            path: Путь к текстовому файлу.
+            encoding: Кодировка файла.
+            chunk_size: Сколько символов читать за раз.
+        """
+        for chunk in iter_file_chunks(path, encoding, chunk_size):
+            self.feed(chunk)
+
+    def finalize(self) -> TextAnalysis:
+        """Завершает анализ: обрабатывает отложенное слово и собирает
+        результат.
+
+        Returns:
+            Результат анализа всего переданного текста.
+        """
+        self.feed("", final=True)
+        return TextAnalysis(
+            words=self.words,
+            word_counts=self.word_counts,
+            longest_word=self.longest_word,
+            most_frequent_word=_most_frequent_word(self.word_counts),
+            count_of_special_chars=self.char_count - self.word_char_count,
+            palindromes=tuple(self.palindromes),
+        )
+
+
+def analyze_text(text: str) -> TextAnalysis:
+    """Анализирует текст за один проход токенизации.
+
+    Словами считаются последовательности букв, цифр и подчёркиваний,
+    содержащие хотя бы одну букву. Спецсимволами считаются все символы вне
+    таких последовательностей, поэтому их количество находится по длине
+    текста без повторного поиска. Палиндромность проверяется один раз для
+    каждого различного слова.
+
+    Args:
+        text: Текст для анализа.
+
+    Returns:
+        Результат анализа текста.
+    """
+    analyzer = StreamingTextAnalyzer(keep_words=True)
+    analyzer.feed(text)
+    return analyzer.finalize()
+
+
+def analyze_file(
+    path: str | os.PathLike, encoding: str = "utf-8", chunk_size: int = READ_CHUNK_SIZE
+) -> TextAnalysis:
+    """Анализирует текстовый файл потоково, не загружая его в память.
+
+    Args:
+        path: Путь к текстовому файлу.
+        encoding: Кодировка файла.
+        chunk_size: Сколько символов читать за раз.
+
+    Returns:
+        Результат анализа без списка слов.
+    """
+    analyzer = StreamingTextAnalyzer()
+    analyzer.feed_file(path, encoding, chunk_size)
+    return analyzer.finalize()
+
+
+def merge_analyses(analyses: Iterable[TextAnalysis]) -> TextAnalysis:
+    """Объединяет результаты анализа частей корпуса в общий результат.
+
+    Части объединяются в переданном порядке, поэтому порядок первого
+    появления слов и выбор самого длинного и самого частого слова такие же,
+    как при последовательном анализе тех же частей.
+
+    Args:
+        analyses: Результаты анализа документов или частей корпуса.
+
+    Returns:
+        Общий результат без списка слов.
+    """
+    word_counts: Dict[str, int] = {}
+    palindromes: Dict[str, None] = {}
+    longest_word: Optional[str] = None
+    count_of_special_chars = 0
+    for analysis in analyses:
+        for word, count in analysis.word_counts.items():
+            word_counts[word] = word_counts.get(word, 0) + count
+        palindromes.update(dict.fromkeys(analysis.palindromes))
+        if analysis.longest_word is not None and (
+            longest_word is None or len(analysis.longest_word) > len(longest_word)
+        ):
+            longest_word = analysis.longest_word
+        count_of_special_chars += analysis.count_of_special_chars
+    return TextAnalysis(
+        words=WordIndex(),
+        word_counts=word_counts,
+        longest_word=longest_word,
+        most_frequent_word=_most_frequent_word(word_counts),
+        count_of_special_chars=count_of_special_chars,
+        palindromes=tuple(palindromes),
+    )
+
+
+@dataclass(frozen=True)
+class CorpusAnalysis:
+    """Результат анализа корпуса документов.
+
+    Attributes:
+        documents: Результаты анализа каждого документа в исходном порядке,
+            без списков слов. У документа без слов word_counts пуст
+            (TextAnalyzer для него выбрасывает SystemError).
+        total: Общий результат по всему корпусу.
+    """
+
+    documents: List[TextAnalysis]
+    total: TextAnalysis
+
+
+def _analyze_document(document: str) -> TextAnalysis:
+    """Анализирует документ, не сохраняя список его слов."""
+    analyzer = StreamingTextAnalyzer()
+    analyzer.feed(document)
+    return analyzer.finalize()
+
+
+def _analyze_batch(documents: List[str]) -> Tuple[List[TextAnalysis], TextAnalysis]:
+    """Анализирует пакет документов в процессе пула.
+
+    Returns:
+        Результаты анализа документов без списков слов и их объединение.
+    """
+    analyses = [_analyze_document(document) for document in documents]
+    return analyses, merge_analyses(analyses)
+
+
+def analyze_corpus(
+    documents: Iterable[str],
+    workers: int | None = None,
+    batch_size: int = CORPUS_BATCH_SIZE,
+) -> CorpusAnalysis:
+    """Анализирует корпус документов в пуле процессов.
+
+    Документы режутся на пакеты по batch_size, каждый процесс возвращает
+    результаты документов пакета и их объединение, а итог собирается
+    объединением пакетов в исходном порядке. Поэтому результаты совпадают
+    с последовательным анализом каждого документа через TextAnalyzer.
+    Одновременно в обработке находится не больше двух пакетов на процесс.
+
+    Args:
+        documents: Итерируемый набор текстов.
+        workers: Количество процессов. По умолчанию - количество ядер.
+        batch_size: Количество документов в одном пакете.
+
+    Returns:
+        Результаты анализа документов и всего корпуса.
+    """
+    document_analyses: List[TextAnalysis] = []
+    batch_totals: List[TextAnalysis] = []
+    batches = iter_batches(documents, batch_size)
+    for analyses, total in iter_parallel_map(_analyze_batch, batches, workers):
+        document_analyses.extend(analyses)
+        batch_totals.append(total)
+    return CorpusAnalysis(
+        documents=document_analyses, total=merge_analyses(batch_totals)
+    )
+
+
+def text_digest(text: str) -> str:
+    """Вычисляет ключ кэша по содержимому текста.
+
+    Args:
+        text: Текст.
+
+    Returns:
+        128-битный хэш BLAKE2b текста в шестнадцатеричном виде.
+    """
+    data = text.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _freeze_analysis(analysis: TextAnalysis) -> TextAnalysis:
+    """Делает результат анализа неизменяемым, чтобы его можно было
+    разделять между обращениями к кэшу."""
+    return replace(
+        analysis,
+        words=analysis.words.freeze(),
+        word_counts=MappingProxyType(dict(analysis.word_counts)),
+        palindromes=tuple(analysis.palindromes),
+    )
+
+
+def _encode_analysis(analysis: TextAnalysis) -> bytes:
+    """Сериализует результат анализа в JSON из простых данных.
+
+    Словарь слов совпадает с порядком word_counts, поэтому хранятся только
+    количества и массив номеров слов (little-endian, base64).
+    """
+    token_ids = array("I", analysis.words.token_ids)
+    if sys.byteorder == "big":
+        token_ids.byteswap()
+    data = {
+        "version": CACHE_FORMAT_VERSION,
+        "word_counts": list(analysis.word_counts.items()),
+        "longest_word": analysis.longest_word,
+        "most_frequent_word": analysis.most_frequent_word,
+        "count_of_special_chars": analysis.count_of_special_chars,
+        "palindromes": list(analysis.palindromes),
+        "token_ids": base64.b64encode(token_ids.tobytes()).decode("ascii"),
+    }
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_analysis(payload: bytes) -> TextAnalysis:
+    """Восстанавливает результат анализа, сериализованный _encode_analysis.
+
+    Raises:
+        ValueError: Если данные повреждены или другой версии формата.
+        KeyError: Если в данных нет нужного поля.
+        TypeError: Если поле не того типа.
+    """
+    data = json.loads(payload)
+    if data["version"] != CACHE_FORMAT_VERSION:
+        raise ValueError("Unsupported cache entry version.")
+    word_counts = {word: int(count) for word, count in data["word_counts"]}
+    token_ids = array("I")
+    token_ids.frombytes(base64.b64decode(data["token_ids"], validate=True))
+    if sys.byteorder == "big":
+        token_ids.byteswap()
+    vocabulary = list(word_counts) if token_ids else []
+    return _freeze_analysis(
+        TextAnalysis(
+            words=WordIndex.from_token_ids(vocabulary, token_ids),
+            word_counts=word_counts,
+            longest_word=data["longest_word"],
+            most_frequent_word=data["most_frequent_word"],
+            count_of_special_chars=int(data["count_of_special_chars"]),
+            palindromes=tuple(data["palindromes"]),
+        )
+    )
+
+
+def _estimate_analysis_size(analysis: TextAnalysis) -> int:
+    """Оценивает размер результата анализа без сериализации.
+
+    Считаются номера слов текста и UTF-8 представление различных слов с
+    местом под их количество. Оценка того же порядка, что и размер
+    JSON-записи, но не равна объёму памяти объектов Python.
+    """
+    token_ids = analysis.words.token_ids
+    return (
+        len(token_ids) * token_ids.itemsize
+        + sum(
+            len(word.encode("utf-8", "surrogatepass")) for word in analysis.word_counts
+        )
+        + len(analysis.word_counts) * CACHE_COUNT_SIZE_ESTIMATE
+    )
+
+
+class AnalysisCache:
+    """Кэш результатов анализа, адресуемый хэшем текста.
+
+    Результаты вытесняются в порядке давности использования (LRU), когда
+    превышено количество записей или их суммарный размер. Размер записи на
+    диске - размер её JSON-файла, а без каталога - оценка по количеству и
+    длине слов, чтобы не сериализовать результат при каждом промахе. Ни то,
+    ни другое не равно объёму памяти, который запись занимает в процессе.
+    Если задан каталог, каждая запись
+    сохраняется в нём отдельным JSON-файлом из простых данных, поэтому кэш
+    переживает перезапуск: при создании записи из каталога подхватываются
+    (в порядке времени последнего использования) и читаются с диска при
+    первом обращении. Версия формата входит в ключ, а нечитаемые записи
+    считаются промахом и удаляются. Возвращаемые результаты общие для всех
+    обращений, поэтому они неизменяемые.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        directory: str | os.PathLike | None = None,
+    ):
+        """Инициализирует экземпляр класса AnalysisCache.
+
+        Args:
+            max_entries: Наибольшее количество записей.
+            max_bytes: Наибольший суммарный размер записей в байтах (размер
+                JSON-файлов или оценка размера данных, а не объём памяти).
+            directory: Каталог для хранения записей на диске. None - только
+                в памяти.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        # None - запись есть на диске, но ещё не прочитана
+        self._entries: OrderedDict[str, Optional[TextAnalysis]] = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._load_directory()
+
+    @staticmethod
+    def _key(text: str) -> str:
+        """Возвращает ключ записи: версию формата и хэш текста."""
+        return f"v{CACHE_FORMAT_VERSION}-{text_digest(text)}"
+
+    def _path(self, key: str) -> str:
+        """Возвращает путь к файлу записи."""
+        return os.path.join(self.directory, f"{key}{CACHE_FILE_SUFFIX}")
+
+    def _load_directory(self):
+        """Подхватывает записи, сохранённые в каталоге ранее."""
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                match = CACHE_FILE_REGEX.fullmatch(entry.name)
+                if match is None or not entry.is_file():
+                    continue
+                if int(match.group(1)) != CACHE_FORMAT_VERSION:
+                    # Запись старого формата уже не прочитать
+                    with suppress(FileNotFoundError):
+                        os.remove(entry.path)
+                    continue
+                stat = entry.stat()
+                key = entry.name.removesuffix(CACHE_FILE_SUFFIX)
+                found.append((stat.st_mtime_ns, key, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = None
+            self._sizes[key] = size
+            self.size_bytes += size
+        self._evict()
+
+    def _remove(self, key: str):
+        """Удаляет запись из памяти и с диска."""
+        del self._entries[key]
+        self.size_bytes -= self._sizes.pop(key)
+        if self.directory is not None:
+            with suppress(FileNotFoundError):
+                os.remove(self._path(key))
+
+    def _evict(self):
+        """Вытесняет давно не использованные записи сверх ограничений."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def get(self, text: str) -> Optional[TextAnalysis]:
+        """Возвращает сохранённый результат анализа текста.
+
+        Args:
+            text: Текст.
+
+        Returns:
+            Результат анализа или None, если его нет в кэше.
+        """
+        key = self._key(text)
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        analysis = self._entries[key]
+        if analysis is None:
+            try:
+                with open(self._path(key), "rb") as file:
+                    analysis = _decode_analysis(file.read())
+            except (OSError, ValueError, KeyError, TypeError):
+                # Файл удалён, повреждён или другого формата - считаем, что
+                # записи нет, и удаляем файл
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries[key] = analysis
+        self._entries.move_to_end(key)
+        if self.directory is not None:
+            with suppress(OSError):
+                os.utime(self._path(key))
+        self.hits += 1
+        return analysis
+
+    def put(self, text: str, analysis: TextAnalysis) -> TextAnalysis:
+        """Сохраняет результат анализа текста.
+
+        Результат больше max_bytes не сохраняется.
+
+        Args:
+            text: Текст.
+            analysis: Результат анализа текста.
+
+        Returns:
+            Неизменяемая копия результата, которую возвращает кэш.
+        """
+        key = self._key(text)
+        analysis = _freeze_analysis(analysis)
+        if self.directory is None:
+            payload = None
+            size = _estimate_analysis_size(analysis)
+        else:
+            payload = _encode_analysis(analysis)
+            size = len(payload)
+        if size > self.max_bytes:
+            return analysis
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = analysis
+        self._sizes[key] = size
+        self.size_bytes += size
+        if payload is not None:
+            # Запись через временный файл, чтобы не оставить половину записи
+            path = self._path(key)
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(payload)
+            os.replace(temporary_path, path)
+        self._evict()
+        return analysis
+
+    def get_or_analyze(self, text: str) -> TextAnalysis:
+        """Возвращает результат анализа текста из кэша или анализирует текст
+        и сохраняет результат.
+
+        Args:
+            text: Текст.
+
+        Returns:
+            Результат анализа текста.
+        """
+        analysis = self.get(text)
+        if analysis is None:
+            analysis = self.put(text, analyze_text(text))
+        return analysis
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счётчики кэша.
+
+        Returns:
+            Словарь с количеством попаданий, промахов, вытеснений, записей и
+            их суммарным размером в байтах.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+        }
+
 
 @class_time_decorator
 class TextAnalyzer:
@@ -24,21 +1013,22 @@ class TextAnalyzer:
 
     __logger: Logger = create_logger("TextAnalyzer")
 
-    def __init__(self, text: StrictStr):
+    def __init__(self, text: StrictStr, cache: Optional[AnalysisCache] = None):
         """Инициализирует экземпляр класса TextAnalyzer.
 
         Args:
             text (str): Текст для анализа.
+            cache: Кэш результатов анализа. Если текст уже анализировался,
+                результат берётся из кэша.
 
         Raises:
             SystemError: Если текст не содержит слов.
         """
         self.text = text
-        self.words: List[str] = [
-            word.lower()
-            for word in re.findall(r"\b\w+\b", text)
-            if not word.isdigit() and any([c.isalpha() for c in word])
-        ]
+        self.analysis = (
+            cache.get_or_analyze(text) if cache is not None else analyze_text(text)
+        )
+        self.words: WordIndex = self.analysis.words
         if not self.words:
             raise SystemError("Initialization failed: text does not contain the words.")
         self.longest_word: Optional[str] = None
@@ -48,7 +1038,11 @@ class TextAnalyzer:
 
     def analyze(self):
         """Анализирует текст, находя самое длинное слово, самое частое слово,
-        количество специальных символов и палиндромы."""
+        количество специальных символов и палиндромы.
+
+        Все результаты уже посчитаны при инициализации, методы только
+        переносят их в атрибуты экземпляра.
+        """
 
         self.find_longest_word()
         self.find_most_frequent_word()
@@ -62,7 +1056,7 @@ class TextAnalyzer:
             Самое длинное слово в тексте.
         """
 
-        self.longest_word = max(self.words, key=len)
+        self.longest_word = self.analysis.longest_word
         return self.longest_word
 
     def find_most_frequent_word(self) -> str:
@@ -72,10 +1066,7 @@ class TextAnalyzer:
             Самое часто встречающееся слово в тексте.
         """
 
-        word_counts = {}
-        for word in self.words:
-            word_counts[word] = word_counts.get(word, 0) + 1
-        self.most_frequent_word = max(word_counts, key=word_counts.get)
+        self.most_frequent_word = self.analysis.most_frequent_word
         return self.most_frequent_word
 
     def count_special_chars(self) -> int:
@@ -85,19 +1076,58 @@ class TextAnalyzer:
             Количество специальных символов в тексте.
         """
 
-        self.count_of_special_charts = len(re.findall(r"\W", self.text))
+        self.count_of_special_charts = self.analysis.count_of_special_chars
         return self.count_of_special_charts
 
     def find_palindromes(self) -> List[str]:
         """Находит все палиндромы в тексте.
 
         Returns:
-            Список палиндромов в тексте.
+            Список различных палиндромов в порядке первого появления.
         """
 
-        self.palindromes = [word for word in self.words if word == word[::-1]]
+        self.palindromes = list(self.analysis.palindromes)
         return self.palindromes
 
+    def find_top_words(self, k: int = TOP_K) -> List[TopWord]:
+        """Находит k самых частых слов в тексте.
+
+        Подсчёт точный: словарь текста уже в памяти. Для потоков с большим
+        словарём есть approximate_top_k_words.
+
+        Args:
+            k: Сколько слов вернуть.
+
+        Returns:
+            Самые частые слова по убыванию количества.
+        """
+
+        return top_k_words(self.analysis.word_counts, k)
+
+    def count_word(self, word: str) -> int:
+        """Подсчитывает количество вхождений слова в текст.
+
+        Args:
+            word: Слово в любом регистре.
+
+        Returns:
+            Количество вхождений слова.
+        """
+
+        return self.analysis.word_counts.get(word.lower(), 0)
+
+    def find_word_positions(self, word: str) -> List[int]:
+        """Находит позиции слова среди слов текста.
+
+        Args:
+            word: Слово в любом регистре.
+
+        Returns:
+            Номера позиций слова по возрастанию, начиная с 0.
+        """
+
+        return self.words.positions(word.lower()).tolist()
+
     def __str__(self) -> str:
         """Возвращает строковое представление результатов анализа текста.
 
@@ -0,0 +1,264 @@
+import io
+import logging
+from collections import Counter
+from itertools import islice, repeat
+
+import pytest
+
+from tasks.task_a import (
+    URLS,
+    BloomFilter,
+    RejectionReason,
+    classify_github_url,
+    count_github_repos,
+    extract_github_project_names,
+    extract_github_project_names_parallel,
+    iter_github_project_names,
+    iter_github_repos,
+    iter_unique_github_repos,
+    iter_url_rejections,
+    split_file_into_shards,
+    validate_github_urls,
+)
+
+URL_LINES = (
+    "https://github.com/owner/first.git\n"
+    "not a url\n"
+    "https://github.com/other/second\r\n"
+    "https://github.com/third/first/tree/main\n"
+    "https://github.com/taфytao/cyrillic\n"
+)
+
+
+@pytest.mark.parametrize(
+    ("url", "project_name"),
+    [
+        ("https://github.com/miguelgrinberg/Flask-SocketIO", "Flask-SocketIO"),
+        ("https://github.com/miguelgrinberg/Flask-SocketIO.git", "Flask-SocketIO"),
+        ("https://github.com/owner/repo/blob/main/README.md", "repo"),
+        ("https://github.com/owner/repo?tab=readme-ov-file", "repo"),
+        ("https://github.com/owner/repo.git#readme", "repo"),
+        ("https://github.com/owner/repo/issues?q=is%3Aopen#top", "repo"),
+        ("https://github.com/owner/repo\n", "repo"),
+        ("https://github.com/owner/repo.git.git", "repo.git"),
+        ("https://github.com/owner/Repo.GIT", "Repo"),
+        ("https://github.com/taytao/.....git", "...."),
+        ("https://github.com/" + "a" * 39 + "/repo", "repo"),
+    ],
+)
+def test_valid_url_yields_project_name(url, project_name):
+    assert list(iter_github_project_names([url])) == [project_name]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        # Запрещённый символ не обрезается, а отклоняет весь URL
+        "https://github.com/nasser/-`-",
+        "https://github.com/nasser/-@-",
+        "https://github.com/taytao/..ф...git",
+        "https://github.com/owner/repo/путь",
+        "https://github.com/owner/repo?q=путь",
+        "https://github.com/owner/repo~tab",
+        "https://github.com/-owner/repo",
+        "https://github.com/ow--ner/repo",
+        "https://github.com//repo",
+        "https://github.com/" + "a" * 40 + "/repo",
+        "http://github.com/owner/repo",
+        "https://gitlab.com/owner/repo",
+        " https://github.com/owner/repo",
+    ],
+)
+def test_invalid_url_is_skipped(url):
+    assert not list(iter_github_project_names([url]))
+
+
+def test_project_names_are_read_from_every_source(tmp_path, monkeypatch):
+    path = tmp_path / "urls.txt"
+    path.write_text(URL_LINES, encoding="utf-8")
+    expected = ["first", "second", "first"]
+
+    assert list(iter_github_project_names(path)) == expected
+    assert list(iter_github_project_names(str(path))) == expected
+    assert list(iter_github_project_names(io.StringIO(URL_LINES))) == expected
+    monkeypatch.setattr("sys.stdin", io.StringIO(URL_LINES))
+    assert list(iter_github_project_names("-")) == expected
+
+
+def test_unique_keeps_first_occurrence_order():
+    urls = io.StringIO(URL_LINES)
+    assert list(iter_github_project_names(urls, unique=True)) == ["first", "second"]
+
+
+def test_extraction_is_lazy():
+    urls = repeat("https://github.com/owner/repo\n")
+    assert list(islice(iter_github_project_names(urls), 3)) == ["repo"] * 3
+
+
+def test_set_extraction_matches_streaming():
+    assert extract_github_project_names(URLS) == set(iter_github_project_names(URLS))
+
+
+def _write_url_file(path, lines: list[str]) -> bytes:
+    data = "".join(lines).encode()
+    path.write_bytes(data)
+    return data
+
+
+@pytest.mark.parametrize("shard_size", [1, 10, 64, 1 << 20])
+@pytest.mark.parametrize("trailing_newline", [True, False])
+def test_every_line_lands_in_exactly_one_shard(tmp_path, shard_size, trailing_newline):
+    lines = [
+        f"https://github.com/o{index}/{'p' * (index % 50)}\n" for index in range(300)
+    ]
+    lines[100:100] = ["\n", "\n"]
+    if not trailing_newline:
+        lines[-1] = lines[-1].rstrip("\n")
+    data = _write_url_file(tmp_path / "urls.txt", lines)
+
+    shards = split_file_into_shards(tmp_path / "urls.txt", shard_size)
+
+    assert shards[0][0] == 0 and shards[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(shards, shards[1:]))
+    assert all(data[:end].endswith(b"\n") for _, end in shards[:-1])
+    shard_lines = [
+        line
+        for start, end in shards
+        for line in data[start:end].splitlines(keepends=True)
+    ]
+    assert shard_lines == data.splitlines(keepends=True)
+
+
+def test_empty_file_has_no_shards(tmp_path):
+    (tmp_path / "urls.txt").write_bytes(b"")
+    assert split_file_into_shards(tmp_path / "urls.txt") == []
+    assert extract_github_project_names_parallel(tmp_path / "urls.txt") == set()
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    urls = sorted(URLS) + [
+        f"https://github.com/owner{index % 7}/project-{index % 40}"
+        + (".git" if index % 3 else ".GIT")
+        for index in range(500)
+    ]
+    _write_url_file(tmp_path / "urls.txt", [f"{url}\n" for url in urls])
+
+    parallel_names = extract_github_project_names_parallel(
+        tmp_path / "urls.txt", workers=2, shard_size=512
+    )
+
+    assert parallel_names == extract_github_project_names(set(urls))
+
+
+@pytest.mark.parametrize(
+    ("url", "reason"),
+    [
+        ("https://github.com/owner/repo", None),
+        ("https://github.com/owner/repo.git\n", None),
+        ("https://gitlab.com/owner/repo", RejectionReason.NOT_GITHUB_URL),
+        ("github.com/owner/repo", RejectionReason.NOT_GITHUB_URL),
+        ("https://github.com/taфytao/....git", RejectionReason.CYRILLIC),
+        ("https://github.com/owner/repo/путь", RejectionReason.CYRILLIC),
+        ("https://github.com/-taytao/repo", RejectionReason.HYPHEN_AT_EDGE),
+        ("https://github.com/taytao-/repo", RejectionReason.HYPHEN_AT_EDGE),
+        ("https://github.com/tay--tao/repo", RejectionReason.DOUBLE_HYPHEN),
+        ("https://github.com//--.git", RejectionReason.BAD_LENGTH),
+        ("https://github.com/owner", RejectionReason.BAD_LENGTH),
+        ("https://github.com/" + "a" * 40 + "/repo", RejectionReason.BAD_LENGTH),
+        ("https://github.com/nass@er/---", RejectionReason.FORBIDDEN_CHAR),
+        ("https://github.com/nass_er/---", RejectionReason.FORBIDDEN_CHAR),
+        ("https://github.com/nasser/-`-", RejectionReason.FORBIDDEN_CHAR),
+    ],
+)
+def test_classify_github_url(url, reason):
+    assert classify_github_url(url) == reason
+
+
+def test_rejections_agree_with_extraction():
+    rejected = dict(iter_url_rejections(URLS))
+    accepted = [url for url in URLS if url not in rejected]
+
+    assert set(iter_github_project_names(accepted)) == extract_github_project_names(
+        URLS
+    )
+    assert not list(iter_github_project_names(rejected))
+
+
+def test_validation_report_counts_and_samples():
+    urls = [f"https://github.com/-owner{index}/repo" for index in range(5)]
+    urls += ["https://github.com/owner/repo.git", "https://github.com/owner/repo"]
+
+    report = validate_github_urls(urls, sample_limit=2)
+
+    assert report.project_names == {"repo"}
+    assert report.valid_count == 2
+    assert report.rejected_count == 5
+    assert report.rejection_counts == {RejectionReason.HYPHEN_AT_EDGE: 5}
+    assert report.rejected_samples == {RejectionReason.HYPHEN_AT_EDGE: urls[:2]}
+    assert not validate_github_urls(urls, sample_limit=0).rejected_samples
+
+
+def test_rejections_are_logged_once(caplog):
+    with caplog.at_level(logging.WARNING, logger="tasks.task_a"):
+        extract_github_project_names(URLS)
+    assert len(caplog.records) == 1
+
+
+@pytest.mark.parametrize("capacity", [1, 100, 5000])
+def test_bloom_filter_has_no_false_negatives(capacity):
+    bloom_filter = BloomFilter(capacity, false_positive_rate=0.01)
+    items = [f"owner{index}/repo{index}" for index in range(capacity)]
+
+    first_adds = [bloom_filter.add(item) for item in items]
+
+    assert all(item in bloom_filter for item in items)
+    assert all(bloom_filter.add(item) for item in items)
+    # Ложноположительные ответы возможны, но их доля близка к заданной
+    assert sum(first_adds) <= max(1, capacity * 0.05)
+
+
+def test_bloom_filter_false_positive_rate_is_close_to_target():
+    bloom_filter = BloomFilter(2000, false_positive_rate=0.01)
+    for index in range(2000):
+        bloom_filter.add(f"member{index}")
+    false_positives = sum(f"stranger{index}" in bloom_filter for index in range(20000))
+    assert false_positives < 20000 * 0.03
+
+
+@pytest.mark.parametrize(
+    ("capacity", "false_positive_rate"), [(0, 0.01), (10, 0), (10, 1)]
+)
+def test_bloom_filter_rejects_bad_parameters(capacity, false_positive_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, false_positive_rate)
+
+
+def test_repos_are_canonical():
+    urls = [
+        "https://github.com/Owner/Repo.git\n",
+        "https://github.com/owner/repo",
+        "https://github.com/OWNER/REPO/issues",
+        "https://github.com/owner/REPO.GIT",
+        "https://github.com/other/repo",
+        "https://github.com/-owner/repo",
+    ]
+
+    assert list(iter_github_repos(urls)) == ["owner/repo"] * 4 + ["other/repo"]
+    assert count_github_repos(urls) == Counter({"owner/repo": 4, "other/repo": 1})
+
+
+def test_unique_repos_with_bloom_filter_match_exact():
+    urls = [
+        f"https://github.com/owner{index % 13}/repo{index % 31}"
+        for index in range(2000)
+    ]
+
+    exact = list(iter_unique_github_repos(urls))
+    approximate = list(
+        iter_unique_github_repos(
+            urls, expected_count=len(exact), false_positive_rate=1e-6
+        )
+    )
+
+    assert len(exact) == len(set(exact)) == 13 * 31
+    assert approximate == exact
@@ -0,0 +1,248 @@
+import logging
+import random
+
+import pytest
+
+from tasks.task_b import (
+    MAX_EXACT_FLOAT_INT,
+    NUMPY_MIN_KEYS,
+    CollisionSafeDict,
+    SortedMapping,
+    _build_dict,
+    _make_sorted_numeric_dict,
+    make_sorted_dict,
+    measure_hash_distribution,
+    np,
+    sort_dict_with_different_key_types,
+)
+
+needs_numpy = pytest.mark.skipif(np is None, reason="numpy не установлен")
+
+
+class Opaque:
+    """Ключ без порядка: такие ключи равны по ключу сортировки."""
+
+
+def test_keys_are_ordered_by_type_group():
+    opaque = Opaque()
+    mapping = SortedMapping(
+        [((1, 2), "t"), (3, "i"), ("b", "s"), (None, "n"), (1.5, "f"), (opaque, "o")]
+    )
+    assert list(mapping) == [None, opaque, "b", 1.5, 3, (1, 2)]
+
+
+def test_equal_sort_keys_keep_insertion_order():
+    first, second = Opaque(), Opaque()
+    mapping = SortedMapping({second: 1, (5, 6): 2, first: 3, (1, 2): 4})
+    assert list(mapping) == [second, first, (5, 6), (1, 2)]
+
+    del mapping[second]
+    mapping[second] = 5
+    assert list(mapping) == [first, second, (5, 6), (1, 2)]
+
+
+def test_reassigning_key_keeps_position():
+    mapping = SortedMapping({"a": 1, "b": 2, "c": 3})
+    mapping["b"] = 20
+    assert list(mapping.items()) == [("a", 1), ("b", 20), ("c", 3)]
+    assert len(mapping) == 3
+
+
+def test_missing_key_raises_key_error():
+    mapping = SortedMapping({1: "one"})
+    with pytest.raises(KeyError):
+        mapping[2]
+    with pytest.raises(KeyError):
+        del mapping[2]
+    assert 2 not in mapping
+    assert mapping.get(2) is None
+
+
+def test_irange_bounds_and_inclusivity():
+    mapping = SortedMapping(dict.fromkeys([None, "x", 1, 2, 3, 4, (0,), (0, 1)]))
+    assert list(mapping.irange(2, 4)) == [2, 3, 4]
+    assert list(mapping.irange(2, 4, inclusive=(False, False))) == [3]
+    assert list(mapping.irange(2.5, 10)) == [3, 4]
+    assert list(mapping.irange(maximum=1)) == [None, "x", 1]
+    assert list(mapping.irange(3)) == [3, 4, (0,), (0, 1)]
+    # Отсутствующий кортеж охватывает все кортежи той же длины
+    assert list(mapping.irange((9,), (9,))) == [(0,)]
+
+
+def test_repr_lists_items_in_order():
+    assert repr(SortedMapping({2: "b", 1: "a"})) == "SortedMapping({1: 'a', 2: 'b'})"
+
+
+def test_random_updates_match_sorting_a_dict():
+    generator = random.Random(5)
+    pool = [None, *range(-5, 6), *"abcde", 0.5, -2.5, (), (1,), (1, 2)]
+    mapping = SortedMapping()
+    reference = {}
+    for step in range(2000):
+        key = generator.choice(pool)
+        if key in reference and generator.random() < 0.4:
+            del mapping[key], reference[key]
+        else:
+            mapping[key] = reference[key] = step
+        if step % 100 == 0:
+            sorted_reference = sort_dict_with_different_key_types(reference)
+            assert list(mapping.items()) == list(sorted_reference.items())
+            low, high = sorted(generator.sample(range(-6, 7), 2))
+            assert list(mapping.irange(low, high)) == [
+                key
+                for key in sorted_reference
+                if isinstance(key, (int, float)) and low <= key <= high
+            ]
+
+
+def _build_and_sort(keys: list, values: list) -> dict:
+    return sort_dict_with_different_key_types(_build_dict(keys, values))
+
+
+def _typed_items(dictionary: dict) -> list[tuple[str, object]]:
+    # repr различает 1 и 1.0, 0.0 и -0.0
+    return [(repr(key), value) for key, value in dictionary.items()]
+
+
+def _warnings(caplog, build, keys: list, values: list) -> tuple[dict, list[str]]:
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="tasks.task_b"):
+        result = build(keys, values)
+    return result, [record.getMessage() for record in caplog.records]
+
+
+@needs_numpy
+@pytest.mark.parametrize(
+    ("keys", "values"),
+    [
+        # Дубликаты, в том числе равные числа разных типов
+        ([3, 1, 3, 1.0, 2, -0.0, 0], list(range(10))),
+        ([0.0, -0.0, 0], [1, 2]),
+        ([-0.0, 0.0, 0], [1, 2]),
+        # Значений меньше, чем различных ключей: ключ на границе теряется
+        ([5, 4, 4, 3, 2, 1], [10, 20]),
+        ([5, 5, 5], []),
+        # Целые за пределами точности float64, но без float
+        ([MAX_EXACT_FLOAT_INT + 1, MAX_EXACT_FLOAT_INT, -(2**62)], [1, 2]),
+        ([MAX_EXACT_FLOAT_INT, 0.5, -MAX_EXACT_FLOAT_INT], [1, 2]),
+        ([float("inf"), float("-inf"), 1e308, -1e-308], [1, 2, 3]),
+    ],
+)
+def test_numeric_fast_path_matches_generic_path(caplog, keys, values):
+    expected, expected_warnings = _warnings(caplog, _build_and_sort, keys, values)
+    result, result_warnings = _warnings(caplog, _make_sorted_numeric_dict, keys, values)
+    assert _typed_items(result) == _typed_items(expected)
+    assert result_warnings == expected_warnings
+
+
+@needs_numpy
+@pytest.mark.parametrize(
+    "keys",
+    [
+        [],
+        [1, "1"],
+        [True, 1],
+        [1.0, float("nan")],
+        [MAX_EXACT_FLOAT_INT + 1, 0.5],
+        [2**63, 1],
+    ],
+)
+def test_numeric_fast_path_falls_back(keys):
+    assert _make_sorted_numeric_dict(keys, [1]) is None
+
+
+@needs_numpy
+def test_random_numeric_keys_match_generic_path(caplog):
+    generator = random.Random(7)
+    pool = [*range(-20, 20), *(index / 4 for index in range(-40, 40)), -0.0]
+    for _ in range(200):
+        keys = generator.choices(pool, k=generator.randint(1, 60))
+        values = list(range(generator.randint(0, 70)))
+        if len(values) == len(keys):
+            values.append(-1)
+        expected, expected_warnings = _warnings(caplog, _build_and_sort, keys, values)
+        result, result_warnings = _warnings(
+            caplog, _make_sorted_numeric_dict, keys, values
+        )
+        assert _typed_items(result) == _typed_items(expected)
+        assert result_warnings == expected_warnings
+
+
+def test_make_sorted_dict_uses_numeric_fast_path_for_large_lists():
+    generator = random.Random(3)
+    keys = [generator.randint(-1000, 1000) for _ in range(NUMPY_MIN_KEYS)]
+    keys[::7] = [key + 0.5 for key in keys[::7]]
+    values = list(range(len(keys) // 2))
+
+    result = make_sorted_dict(keys, values)
+
+    assert _typed_items(result) == _typed_items(_build_and_sort(keys, values))
+
+
+class ConstantHash:
+    """Ключ с одним и тем же хэшем и сравнением по идентичности."""
+
+    def __hash__(self):
+        return 42
+
+
+class ConstantHashValue:
+    """Ключ с одним и тем же хэшем и сравнением по значению."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, ConstantHashValue) and other.value == self.value
+
+
+def test_hash_distribution_report():
+    colliding = [ConstantHash() for _ in range(10)]
+    report = measure_hash_distribution(colliding + colliding + [1, 2, [3]], threshold=5)
+
+    assert report.total_keys == 12
+    assert report.distinct_hashes == 3
+    assert report.largest_bucket == 10
+    assert report.colliding_hashes == {42: 10}
+    assert report.collision_rate == pytest.approx(1 - 3 / 12)
+    assert report.is_pathological
+    assert not measure_hash_distribution(colliding, threshold=10).is_pathological
+
+
+def test_colliding_keys_build_collision_safe_dict_with_same_items():
+    keys = [ConstantHash() for _ in range(300)] + ["b", 1, "a", None]
+    keys.insert(150, keys[10])
+    values = list(range(len(keys) + 3))
+
+    result = make_sorted_dict(keys, values, collision_threshold=64)
+    expected = make_sorted_dict(keys, values)
+
+    assert isinstance(result, CollisionSafeDict)
+    assert type(expected) is dict
+    assert list(result.items()) == list(expected.items())
+    assert all(result[key] == expected[key] for key in keys)
+    assert ConstantHash() not in result
+
+
+def test_collision_safe_dict_behaves_like_dict():
+    identity_keys = [ConstantHash() for _ in range(5)]
+    dictionary = CollisionSafeDict(colliding_hashes={42})
+    for index, key in enumerate(identity_keys):
+        dictionary[key] = index
+    dictionary[ConstantHashValue(1)] = "one"
+
+    assert dictionary[ConstantHashValue(1)] == "one"
+    assert dictionary[identity_keys[3]] == 3
+    del dictionary[identity_keys[3]]
+    assert identity_keys[3] not in dictionary
+    with pytest.raises(KeyError):
+        dictionary[ConstantHash()]
+    assert list(dictionary) == [
+        *identity_keys[:3],
+        identity_keys[4],
+        ConstantHashValue(1),
+    ]
+    assert len(dictionary) == 5
@@ -0,0 +1,180 @@
+import random
+from collections import Counter
+from enum import StrEnum
+from itertools import chain, count, islice
+
+import pytest
+
+from tasks.task_c import (
+    MAX_INT64_SQUARE_ROOT,
+    NUMPY_MIN_ITEMS,
+    _decode_chunk,
+    _encode_chunk,
+    _modify_batch,
+    _square_batch,
+    is_valid_value,
+    iter_batches,
+    iter_parallel_map,
+    iter_validated_modified,
+    modify_list,
+    modify_list_batch,
+    modify_list_parallel,
+    np,
+    strict_validation,
+)
+
+needs_numpy = pytest.mark.skipif(np is None, reason="numpy не установлен")
+
+
+class Color(StrEnum):
+    RED = "red"
+
+
+@pytest.mark.parametrize(
+    "numbers",
+    [
+        [],
+        [0, -3, 7],
+        [MAX_INT64_SQUARE_ROOT, -MAX_INT64_SQUARE_ROOT],
+        # Квадрат не помещается в int64 или само число не помещается
+        [1, MAX_INT64_SQUARE_ROOT + 1],
+        [1, -MAX_INT64_SQUARE_ROOT - 1],
+        [1, 2**63],
+        [True, 2],
+        [2.5, 3],
+    ],
+)
+def test_square_batch_matches_python_squares(numbers):
+    squares = _square_batch(numbers)
+    assert squares == [number**2 for number in numbers]
+    assert list(map(type, squares)) == [type(number**2) for number in numbers]
+
+
+@pytest.mark.parametrize(
+    "batch",
+    [
+        ["a"],
+        [1, 2],
+        ["a", 1, "b", 2**70, "", -5],
+        [0, "x", 3],
+        # Подклассы str - тоже строки
+        [Color.RED, 1],
+        [Color.RED, "a"],
+    ],
+)
+def test_modify_batch_keeps_positions(batch):
+    assert _modify_batch(batch) == modify_list(batch)
+
+
+@needs_numpy
+def test_batch_engine_matches_modify_list():
+    generator = random.Random(9)
+    pool = [
+        lambda: generator.randint(-1000, 1000),
+        lambda: generator.randint(-(2**70), 2**70),
+        lambda: generator.choice(["", "a", "bc"]),
+    ]
+    for _ in range(10):
+        # Длинные однородные участки и участки вперемешку
+        data = []
+        while len(data) < NUMPY_MIN_ITEMS:
+            make = generator.choice(pool)
+            data.extend(make() for _ in range(generator.choice([1, 5, 500])))
+        batch_size = generator.choice([1, 7, 1000, len(data)])
+
+        assert modify_list_batch(data, batch_size) == modify_list(data)
+
+
+@pytest.mark.parametrize(
+    ("value", "valid"),
+    [
+        ("", True),
+        ("abc", True),
+        (0, True),
+        (9, True),
+        (10, False),
+        (-1, False),
+        (True, False),
+        (False, False),
+        (1.0, False),
+        (None, False),
+        (b"a", False),
+    ],
+)
+def test_is_valid_value(value, valid):
+    assert is_valid_value(value) is valid
+
+
+def test_strict_validation_keeps_values_equal_to_rejected_ones():
+    # True == 1 и False == 0, но отклоняются только bool
+    assert strict_validation([1, True, 0, False, 1.0, "1"]) == [1, 0, "1"]
+
+
+def test_invalid_values_are_reported_in_order():
+    invalid = []
+    counter = Counter()
+    data = ["a", 12, None, 3, True, "b", 4.0]
+
+    chunks = list(iter_validated_modified(data, 3, invalid.append, counter))
+
+    assert chunks == [["abc_a_cba"], [9, "abc_b_cba"], []]
+    assert invalid == [12, None, True, 4.0]
+    assert counter == Counter(valid=3, invalid=4)
+
+
+def test_empty_input_yields_no_chunks():
+    assert not list(iter_validated_modified([]))
+
+
+def test_input_is_consumed_lazily():
+    chunks = iter_validated_modified(count(), chunk_size=4)
+    assert list(islice(chunks, 3)) == [[0, 1, 4, 9], [16, 25, 36, 49], [64, 81]]
+
+
+def test_streaming_pass_matches_validation_then_modification():
+    generator = random.Random(11)
+    pool = [*range(-3, 13), "", "a", "bc", True, False, 2.0, None, (1,)]
+    for _ in range(100):
+        data = generator.choices(pool, k=generator.randint(0, 200))
+        chunk_size = generator.randint(1, 50)
+
+        chunks = list(iter_validated_modified(iter(data), chunk_size))
+
+        assert list(chain.from_iterable(chunks)) == modify_list(strict_validation(data))
+        assert len(chunks) == -(-len(data) // chunk_size)
+
+
+@pytest.mark.parametrize(
+    "chunk",
+    [[], [1, "a", -2, ""], ["a", "b"], [2**63, "a"], [1.5, None, "a"], [True, 1]],
+)
+def test_chunk_encoding_round_trips(chunk):
+    decoded = _decode_chunk(_encode_chunk(chunk))
+    assert decoded == chunk
+    assert list(map(type, decoded)) == list(map(type, chunk))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_pipeline_matches_serial(workers):
+    generator = random.Random(workers)
+    pool = [*range(-3, 13), "", "a", "bc", True, 2.0, None]
+    data = generator.choices(pool, k=2000)
+    counter = Counter()
+
+    result = modify_list_parallel(
+        iter(data), workers=workers, chunk_size=37, counter=counter
+    )
+
+    expected = modify_list(strict_validation(data))
+    assert result == expected
+    assert counter == Counter(valid=len(expected), invalid=len(data) - len(expected))
+
+
+def test_iter_batches_keeps_remainder():
+    assert list(iter_batches(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert not list(iter_batches([], 3))
+
+
+def test_parallel_map_keeps_order_and_reads_batches_lazily():
+    results = iter_parallel_map(sum, iter_batches(count(), 3), workers=2)
+    assert list(islice(results, 5)) == [3, 12, 21, 30, 39]
@@ -0,0 +1,356 @@
+import asyncio
+import json
+import random
+import time
+
+import pytest
+
+from tasks import delay_server, task_d
+from tasks.delay_server import (
+    DelayServerConfig,
+    delay_handler,
+    delay_server_in_thread,
+)
+from tasks.task_d import (
+    BODY_TOO_LARGE_MESSAGE,
+    CONNECTION_ERROR_MESSAGE,
+    HISTOGRAM_SUB_BUCKET_BITS,
+    TIMEOUT_ERROR_MESSAGE,
+    HedgePolicy,
+    LatencyHistogram,
+    LoadStats,
+    RetryPolicy,
+    _hedged_get,
+    _is_retryable,
+    fetch,
+    make_session,
+    resilient_get,
+)
+
+NO_BACKOFF = RetryPolicy(attempts=2, base_delay=0.0, max_delay=0.0)
+# Дубликат через 50 мс независимо от накопленных задержек
+FAST_HEDGE = HedgePolicy(min_samples=1 << 30, initial_delay=0.05)
+
+
+def _histogram(latencies) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    for seconds in latencies:
+        histogram.record(seconds)
+    return histogram
+
+
+def _nearest_rank(values: list[int], percent: float) -> int:
+    rank = max(1, -(-len(values) * percent // 100))
+    return sorted(values)[int(rank) - 1]
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.summary() == {"count": 0}
+
+
+def test_small_latencies_are_exact():
+    # Меньше 2**bits микросекунд корзины имеют ширину 1
+    histogram = _histogram([0.000_001 * value for value in range(1, 101)])
+    assert histogram.percentile(50) == pytest.approx(0.000_050)
+    assert histogram.percentile(99) == pytest.approx(0.000_099)
+    assert histogram.percentile(100) == pytest.approx(0.000_100)
+    assert histogram.summary()["mean"] == pytest.approx(0.000_050_5)
+
+
+def test_percentile_never_exceeds_max():
+    histogram = _histogram([1.0, 1.000_01, 3.141_59])
+    assert histogram.percentile(100) == pytest.approx(3.141_59)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_percentiles_are_within_bucket_precision(seed):
+    generator = random.Random(seed)
+    latencies = [generator.lognormvariate(-5, 2) for _ in range(5000)]
+    histogram = _histogram(latencies)
+    values = [round(seconds * 1_000_000) for seconds in latencies]
+
+    relative_error = 1 / (1 << (HISTOGRAM_SUB_BUCKET_BITS - 1))
+    for percent in (0, 1, 25, 50, 90, 99, 99.9, 100):
+        exact = _nearest_rank(values, percent)
+        estimate = round(histogram.percentile(percent) * 1_000_000)
+        assert exact <= estimate <= exact * (1 + relative_error)
+
+
+def test_merge_equals_single_histogram_and_survives_json():
+    generator = random.Random(4)
+    latencies = [generator.expovariate(20) for _ in range(3000)]
+    first, second = _histogram(latencies[:1000]), _histogram(latencies[1000:])
+
+    first.merge(second)
+    first.merge(LatencyHistogram())
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(first.to_dict())))
+
+    whole = _histogram(latencies)
+    assert first.to_dict() == whole.to_dict()
+    assert restored.to_dict() == whole.to_dict()
+    assert restored.summary() == whole.summary()
+
+
+def test_merge_rejects_different_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram(5).merge(LatencyHistogram(6))
+
+
+def test_load_stats_timeline_and_merge():
+    stats, other = LoadStats(), LoadStats()
+    other.started_at = stats.started_at
+    stats.record(200, 0.1, stats.started_at + 0.5)
+    stats.record(500, 0.2, stats.started_at + 0.7)
+    other.record(TIMEOUT_ERROR_MESSAGE, 10.0, stats.started_at + 2.5)
+
+    stats.merge(other)
+
+    assert stats.status_counts == {200: 1, 500: 1, TIMEOUT_ERROR_MESSAGE: 1}
+    assert stats.latency.count == 3
+    assert [
+        (point["second"], point["requests"], point["errors"])
+        for point in stats.timeline()
+    ] == [(0, 2, 1), (1, 0, 0), (2, 1, 1)]
+    assert json.loads(stats.to_json())["status_counts"] == {
+        "200": 1,
+        "500": 1,
+        TIMEOUT_ERROR_MESSAGE: 1,
+    }
+
+
+@pytest.fixture(scope="module")
+def ok_server():
+    with delay_server_in_thread(DelayServerConfig(seed=1)) as base_url:
+        yield base_url
+
+
+@pytest.fixture(scope="module")
+def failing_server():
+    with delay_server_in_thread(DelayServerConfig(error_rate=1.0, seed=1)) as base_url:
+        yield base_url
+
+
+def _resilient_get(url: str, **options) -> tuple[object, LoadStats]:
+    stats = LoadStats()
+
+    async def _scenario():
+        async with make_session() as session:
+            return await resilient_get(session, url, stats=stats, **options)
+
+    return asyncio.run(_scenario()), stats
+
+
+@pytest.mark.parametrize(
+    ("status", "retryable"),
+    [
+        (200, False),
+        (404, False),
+        (429, True),
+        (500, True),
+        (503, True),
+        (TIMEOUT_ERROR_MESSAGE, True),
+        (CONNECTION_ERROR_MESSAGE, True),
+        (BODY_TOO_LARGE_MESSAGE, False),
+    ],
+)
+def test_is_retryable(status, retryable):
+    assert _is_retryable(status) is retryable
+
+
+def test_retry_backoff_is_bounded_by_exponential_ceiling():
+    policy = RetryPolicy(attempts=5, base_delay=0.1, max_delay=0.5)
+    for retry in range(1, 7):
+        ceiling = min(0.5, 0.1 * 2 ** (retry - 1))
+        pauses = [policy.backoff(retry) for _ in range(200)]
+        assert all(0 <= pause <= ceiling for pause in pauses)
+        # Разброс полный: паузы не прижаты к потолку
+        assert min(pauses) < ceiling / 4
+
+
+def test_hedge_delay_switches_to_percentile():
+    policy = HedgePolicy(percentile=50, min_samples=3, initial_delay=1.0)
+    latency = LatencyHistogram()
+    latency.record(0.1)
+    latency.record(0.3)
+    assert policy.delay(latency) == 1.0
+    latency.record(0.2)
+    assert policy.delay(latency) == pytest.approx(0.2, rel=1 / 64)
+
+
+def test_failed_request_is_retried_and_counted(failing_server):
+    status, stats = _resilient_get(f"{failing_server}/delay/0", retry_policy=NO_BACKOFF)
+    assert status == 500
+    assert (stats.retries, stats.hedges, stats.hedge_wins) == (2, 0, 0)
+
+
+def test_successful_request_is_not_retried(ok_server):
+    status, stats = _resilient_get(f"{ok_server}/delay/0", retry_policy=NO_BACKOFF)
+    assert status == 200
+    assert stats.retries == 0
+
+
+def test_dropped_connection_is_retried():
+    with delay_server_in_thread(DelayServerConfig(drop_rate=1.0)) as base_url:
+        status, stats = _resilient_get(f"{base_url}/delay/0", retry_policy=NO_BACKOFF)
+    assert status == CONNECTION_ERROR_MESSAGE
+    assert stats.retries == 2
+
+
+def test_dropped_connection_is_sent_once_per_attempt(monkeypatch):
+    requests = []
+
+    async def _counting_handler(request):
+        requests.append(request.path)
+        return await delay_handler(request)
+
+    monkeypatch.setattr(delay_server, "delay_handler", _counting_handler)
+    with delay_server_in_thread(DelayServerConfig(drop_rate=1.0)) as base_url:
+        _, stats = _resilient_get(f"{base_url}/delay/0", retry_policy=NO_BACKOFF)
+    # Сам aiohttp не повторяет запрос, все повторы видны в статистике
+    assert len(requests) == stats.retries + 1 == 3
+
+
+def test_fast_response_is_not_hedged(ok_server):
+    status, stats = _resilient_get(
+        f"{ok_server}/delay/0", hedge_policy=HedgePolicy(initial_delay=1.0)
+    )
+    assert status == 200
+    assert (stats.hedges, stats.hedge_wins) == (0, 0)
+
+
+def test_fetch_counts_retries_of_every_request(failing_server):
+    stats = LoadStats()
+    result = asyncio.run(
+        fetch(f"{failing_server}/delay/0", 5, 5, retry_policy=NO_BACKOFF, stats=stats)
+    )
+    assert result == [500] * 5
+    assert stats.status_counts == {500: 5}
+    assert stats.retries == 10
+
+
+class ScriptedSession:
+    """Сессия, отправляющая каждую следующую попытку на свой URL."""
+
+    def __init__(self, session, urls):
+        self._session = session
+        self._urls = iter(urls)
+
+    def get(self, url):
+        return self._session.get(next(self._urls))
+
+
+def _hedged(*urls: str, hedge_policy: HedgePolicy = FAST_HEDGE):
+    """Выполняет _hedged_get, где основная попытка и дубликат идут на urls.
+
+    Returns:
+        Результат, статистика и время выполнения в секундах.
+    """
+    stats = LoadStats()
+
+    async def _scenario():
+        async with make_session() as session:
+            return await _hedged_get(
+                ScriptedSession(session, urls),
+                "",
+                body_mode=task_d.BodyMode.STATUS_ONLY,
+                max_body_size=task_d.MAX_BODY_SIZE,
+                stats=stats,
+                hedge_policy=hedge_policy,
+                attempt_latency=LatencyHistogram(),
+            )
+
+    begin = time.perf_counter()
+    status = asyncio.run(_scenario())
+    return status, stats, time.perf_counter() - begin
+
+
+def test_fast_hedge_wins_over_slow_primary(ok_server):
+    status, stats, elapsed = _hedged(f"{ok_server}/delay/2", f"{ok_server}/delay/0")
+    assert status == 200
+    assert (stats.hedges, stats.hedge_wins) == (1, 1)
+    assert elapsed < 1
+
+
+def test_primary_finishing_first_wins(ok_server):
+    status, stats, elapsed = _hedged(f"{ok_server}/delay/0.1", f"{ok_server}/delay/2")
+    assert status == 200
+    assert (stats.hedges, stats.hedge_wins) == (1, 0)
+    # Дубликат отменён, а не дождан
+    assert elapsed < 1
+
+
+def test_successful_hedge_wins_over_failed_primary(ok_server, failing_server):
+    status, stats, _ = _hedged(f"{failing_server}/delay/0.1", f"{ok_server}/delay/0.2")
+    assert status == 200
+    assert (stats.hedges, stats.hedge_wins) == (1, 1)
+
+
+def test_failed_hedge_is_not_counted_as_win(failing_server):
+    status, stats, _ = _hedged(
+        f"{failing_server}/delay/0.1", f"{failing_server}/delay/0.2"
+    )
+    assert status == 500
+    assert (stats.hedges, stats.hedge_wins) == (1, 0)
+
+
+def test_simultaneous_finish_prefers_success(monkeypatch):
+    release = asyncio.Event()
+    statuses = iter([500, 200])
+
+    async def _fake_timed_get(*args, **kwargs):
+        status = next(statuses)
+        # Дубликат отпускает обе попытки, и они завершаются вместе
+        if status == 200:
+            release.set()
+        await release.wait()
+        return status
+
+    monkeypatch.setattr(task_d, "_timed_get", _fake_timed_get)
+    status, stats, _ = _hedged("", "")
+    assert status == 200
+    assert (stats.hedges, stats.hedge_wins) == (1, 1)
+
+
+@pytest.mark.parametrize("cancel_after", [0.01, 0.2])
+def test_cancellation_leaves_no_pending_attempts(ok_server, cancel_after):
+    """Отмена до и после отправки дубликата отменяет все попытки."""
+
+    async def _scenario():
+        async with make_session() as session:
+            scripted = ScriptedSession(session, [f"{ok_server}/delay/5"] * 2)
+            request = asyncio.create_task(
+                resilient_get(scripted, "", hedge_policy=FAST_HEDGE)
+            )
+            await asyncio.sleep(cancel_after)
+            request.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await request
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert not asyncio.run(_scenario())
+
+
+def test_resilient_get_counts_hedges_and_retries(failing_server):
+    status, stats = _resilient_get(
+        f"{failing_server}/delay/0.1",
+        retry_policy=NO_BACKOFF,
+        hedge_policy=FAST_HEDGE,
+    )
+    assert status == 500
+    assert (stats.hedges, stats.hedge_wins, stats.retries) == (3, 0, 2)
+
+
+@pytest.mark.parametrize("connection_mode", list(task_d.ConnectionMode))
+def test_client_sees_configured_drop_rate(connection_mode):
+    count = 400
+    config = DelayServerConfig(drop_rate=0.5, seed=3)
+    with delay_server_in_thread(config) as base_url:
+        result = asyncio.run(
+            fetch(f"{base_url}/delay/0", count, 20, connection_mode=connection_mode)
+        )
+    # Без скрытого повтора aiohttp доля ошибок не сжимается до 0.5 ** 2
+    dropped = result.count(CONNECTION_ERROR_MESSAGE)
+    assert 0.35 * count <= dropped <= 0.65 * count
+    assert result.count(200) == count - dropped
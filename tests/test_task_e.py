@@ -0,0 +1,420 @@
+import json
+import os
+import random
+from collections import Counter
+
+import pytest
+
+from tasks.task_e import (
+    AnalysisCache,
+    SpaceSavingCounter,
+    StreamingTextAnalyzer,
+    TextAnalysis,
+    TextAnalyzer,
+    TopWord,
+    WordIndex,
+    analyze_corpus,
+    analyze_file,
+    analyze_text,
+    approximate_top_k_file,
+    approximate_top_k_words,
+    iter_words,
+    top_k_words,
+)
+
+ALPHABET = "абвгдаАБdeDE0_1 .,!-\n\r"
+VOCABULARY = [f"w{index}" for index in range(60)]
+
+
+def _summary(analysis: TextAnalysis) -> tuple:
+    """Результат анализа без списка слов; палиндромы без повторов."""
+    return (
+        dict(analysis.word_counts),
+        analysis.longest_word,
+        analysis.most_frequent_word,
+        analysis.count_of_special_chars,
+        list(dict.fromkeys(analysis.palindromes)),
+    )
+
+
+def _random_text(generator: random.Random) -> str:
+    return "".join(generator.choices(ALPHABET, k=generator.randint(0, 300)))
+
+
+def _random_words(generator: random.Random) -> list[str]:
+    """Слова с распределением, близким к закону Ципфа."""
+    exponent = generator.uniform(0.5, 1.5)
+    weights = [1 / (rank + 1) ** exponent for rank in range(len(VOCABULARY))]
+    return generator.choices(VOCABULARY, weights, k=generator.randint(0, 3000))
+
+
+def _random_chunks(generator: random.Random, text: str) -> list[str]:
+    """Разрезает текст на непустые части в случайных местах."""
+    positions = range(1, len(text))
+    cuts = sorted(
+        generator.sample(positions, generator.randint(0, min(len(positions), 20)))
+    )
+    bounds = [0, *cuts, len(text)] if text else []
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def test_analyze_text():
+    analysis = analyze_text("Шалаш, шалаш! Казак_1 и 42 ...\r\n")
+    assert list(analysis.words) == ["шалаш", "шалаш", "казак_1", "и"]
+    assert analysis.word_counts == {"шалаш": 2, "казак_1": 1, "и": 1}
+    assert analysis.longest_word == "казак_1"
+    assert analysis.most_frequent_word == "шалаш"
+    # Число 42 не слово, но и не спецсимволы
+    assert analysis.count_of_special_chars == 12
+    assert analysis.palindromes == ("шалаш", "и")
+
+
+def test_empty_text():
+    analysis = analyze_text("")
+    assert list(analysis.words) == []
+    assert analysis.longest_word is None
+    assert analysis.most_frequent_word is None
+    assert analysis.count_of_special_chars == 0
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        ["Час", "то"],
+        ["Ча", "с", "то"],
+        ["Часто", ""],
+        # Пустая часть не завершает текст
+        ["Час", "", "то"],
+        ["", "Часто", "", ""],
+    ],
+)
+def test_word_split_by_chunk_boundary(chunks):
+    analyzer = StreamingTextAnalyzer(keep_words=True)
+    for chunk in chunks:
+        analyzer.feed(chunk)
+    assert list(analyzer.finalize().words) == ["часто"]
+
+
+def test_chunked_analysis_matches_whole_text():
+    generator = random.Random(21)
+    for _ in range(300):
+        text = _random_text(generator)
+        analyzer = StreamingTextAnalyzer(keep_words=True)
+        for chunk in _random_chunks(generator, text):
+            analyzer.feed(chunk)
+        assert analyzer.finalize() == analyze_text(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 20])
+def test_file_analysis_matches_text_analysis(tmp_path, chunk_size):
+    generator = random.Random(chunk_size)
+    text = "".join(_random_text(generator) for _ in range(10))
+    path = tmp_path / "text.txt"
+    path.write_bytes(text.encode("utf-8"))
+
+    analysis = analyze_file(path, chunk_size=chunk_size)
+
+    assert list(analysis.words) == []
+    assert _summary(analysis) == _summary(analyze_text(text))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_corpus_analysis_matches_serial_analysis(workers):
+    generator = random.Random(22)
+    documents = [_random_text(generator) for _ in range(50)]
+
+    corpus = analyze_corpus(documents, workers=workers, batch_size=7)
+
+    assert [_summary(analysis) for analysis in corpus.documents] == [
+        _summary(analyze_text(document)) for document in documents
+    ]
+    # Переводы строк между документами добавляют спецсимволы
+    word_counts, longest, most_frequent, special_chars, palindromes = _summary(
+        analyze_text("\n".join(documents))
+    )
+    assert _summary(corpus.total) == (
+        word_counts,
+        longest,
+        most_frequent,
+        special_chars - len(documents) + 1,
+        palindromes,
+    )
+
+
+def test_top_k_words_keeps_first_seen_order_for_ties():
+    word_counts = {"b": 2, "a": 3, "c": 2, "d": 1}
+    assert top_k_words(word_counts, 3) == [
+        TopWord("a", 3),
+        TopWord("b", 2),
+        TopWord("c", 2),
+    ]
+    assert top_k_words(word_counts, 10) == top_k_words(word_counts, 4)
+    assert not top_k_words({}, 3)
+
+
+def test_space_saving_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        SpaceSavingCounter(0)
+
+
+def test_space_saving_new_word_inherits_evicted_count():
+    counter = SpaceSavingCounter(2)
+    counter.update(["a", "a", "b", "c", "c"])
+    assert counter.top_k(2) == [TopWord("c", 3, 1), TopWord("a", 2)]
+    assert counter.error_bound == 1
+
+
+def test_space_saving_bounds_hold():
+    generator = random.Random(23)
+    for _ in range(50):
+        words = _random_words(generator)
+        counter = SpaceSavingCounter(generator.randint(1, 30))
+        counter.update(words)
+        exact = Counter(words)
+
+        assert counter.total == len(words)
+        assert len(counter.counts) <= counter.capacity
+        for word, count in counter.counts.items():
+            assert count - counter.errors[word] <= exact[word] <= count
+        # Слово чаще total / capacity вытеснено быть не может
+        for word, count in exact.items():
+            if count > counter.total / counter.capacity:
+                assert word in counter.counts
+
+
+def test_approximate_top_k_file_is_exact_with_enough_capacity(tmp_path):
+    generator = random.Random(24)
+    text = " ".join(_random_words(generator))
+    path = tmp_path / "text.txt"
+    path.write_text(text, encoding="utf-8")
+
+    approximate = approximate_top_k_file(
+        path, k=15, capacity=len(VOCABULARY), chunk_size=7
+    )
+
+    assert approximate == top_k_words(analyze_text(text).word_counts, 15)
+
+
+def test_word_index_is_a_sequence_of_words():
+    index = WordIndex(["b", "a", "b"])
+    assert list(index) == ["b", "a", "b"]
+    assert (len(index), index[0], index[-1], index[1:]) == (3, "b", "b", ["a", "b"])
+    assert index.vocabulary == ["b", "a"]
+    assert "a" in index and "c" not in index
+    assert index == WordIndex(["b", "a", "b"]) != WordIndex(["a", "b", "b"])
+
+
+def test_word_index_matches_naive_scan():
+    generator = random.Random(25)
+    for _ in range(30):
+        words = _random_words(generator)
+        index = WordIndex()
+        for position, word in enumerate(words):
+            index.append(word)
+            # Индекс, построенный по части слов, перестраивается после append
+            if generator.random() < 0.002:
+                assert index.count(word) == words[: position + 1].count(word)
+
+        assert list(index) == words
+        for word in [*VOCABULARY, "missing"]:
+            assert index.positions(word).tolist() == [
+                position for position, item in enumerate(words) if item == word
+            ]
+            assert index.count(word) == words.count(word)
+
+
+def test_text_analyzer_counts_and_finds_words_in_any_case():
+    analyzer = TextAnalyzer("Шалаш, дом и шалаш. ШАЛАШ!")
+    assert analyzer.count_word("Шалаш") == 3
+    assert analyzer.find_word_positions("шАлАш") == [0, 3, 4]
+    assert analyzer.count_word("нет") == 0
+    assert not analyzer.find_word_positions("нет")
+
+
+def _fill(cache: AnalysisCache, texts: list[str]):
+    for text in texts:
+        cache.get_or_analyze(text)
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = AnalysisCache(max_entries=2)
+    _fill(cache, ["раз", "два"])
+    assert cache.get("раз") == analyze_text("раз")
+    cache.get_or_analyze("три")
+
+    assert cache.get("два") is None
+    assert cache.get("раз") is not None
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 4,
+        "evictions": 1,
+        "entries": 2,
+        "bytes": cache.size_bytes,
+    }
+
+
+def test_cache_evicts_entries_over_byte_limit():
+    texts = [f"слово{index} " * (index + 1) for index in range(3)]
+    sizes = []
+    probe = AnalysisCache()
+    for text in texts:
+        before = probe.size_bytes
+        probe.put(text, analyze_text(text))
+        sizes.append(probe.size_bytes - before)
+
+    cache = AnalysisCache(max_bytes=sum(sizes) - 1)
+    _fill(cache, texts)
+    assert cache.get(texts[0]) is None
+    assert (len(cache), cache.size_bytes) == (2, sizes[1] + sizes[2])
+
+    # Результат больше всего кэша не сохраняется и ничего не вытесняет
+    cache = AnalysisCache(max_bytes=sizes[1])
+    _fill(cache, texts[:2])
+    cache.put(texts[2], analyze_text(texts[2]))
+    assert cache.get(texts[2]) is None
+    assert (len(cache), cache.evictions) == (1, 1)
+
+
+def test_memory_cache_does_not_serialize_entries(monkeypatch, tmp_path):
+    def _fail(analysis):
+        raise AssertionError("entry was serialized")
+
+    text = "раз два раз"
+    on_disk = AnalysisCache(directory=tmp_path)
+    on_disk.put(text, analyze_text(text))
+    monkeypatch.setattr("tasks.task_e._encode_analysis", _fail)
+
+    cache = AnalysisCache()
+    cache.put(text, analyze_text(text))
+    # Оценка того же порядка, что и размер JSON-файла записи
+    assert 0 < cache.size_bytes < on_disk.size_bytes
+    assert cache.get(text) == analyze_text(text)
+
+
+def test_cache_survives_restart(tmp_path):
+    texts = ["раз два", "шалаш", "три"]
+    _fill(AnalysisCache(max_entries=2, directory=tmp_path), texts)
+    assert len(os.listdir(tmp_path)) == 2
+    # Время изменения файлов грубее порядка записей, поэтому сдвигаем его
+    for age, name in enumerate(sorted(os.listdir(tmp_path)), start=1):
+        os.utime(tmp_path / name, (0, os.stat(tmp_path / name).st_mtime - 60 * age))
+
+    restarted = AnalysisCache(max_entries=2, directory=tmp_path)
+    assert len(restarted) == 2
+    assert restarted.get(texts[0]) is None
+    assert restarted.get(texts[1]) == analyze_text(texts[1])
+
+    # Обращение обновляет порядок LRU и на диске
+    restarted = AnalysisCache(max_entries=1, directory=tmp_path)
+    assert restarted.get(texts[1]) is not None
+    assert restarted.get(texts[2]) is None
+    assert len(os.listdir(tmp_path)) == 1
+
+
+@pytest.mark.parametrize("content", [b"", b"\x00garbage"])
+def test_corrupt_cache_file_is_a_miss(tmp_path, content):
+    AnalysisCache(directory=tmp_path).put("шалаш", analyze_text("шалаш"))
+    [name] = os.listdir(tmp_path)
+    (tmp_path / name).write_bytes(content)
+
+    restarted = AnalysisCache(directory=tmp_path)
+    assert restarted.get("шалаш") is None
+    assert restarted.get_or_analyze("шалаш") == analyze_text("шалаш")
+    assert AnalysisCache(directory=tmp_path).get("шалаш") == analyze_text("шалаш")
+
+
+def test_text_analyzer_uses_cache():
+    cache = AnalysisCache()
+    first = TextAnalyzer("Шалаш и дом", cache=cache)
+    second = TextAnalyzer("Шалаш и дом", cache=cache)
+    assert second.analysis is first.analysis
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_iter_words_matches_whole_text_analysis():
+    generator = random.Random(26)
+    for _ in range(300):
+        text = _random_text(generator)
+        chunks = _random_chunks(generator, text)
+        # Пустые части в любом месте потока ничего не меняют
+        for _ in range(generator.randint(0, 3)):
+            chunks.insert(generator.randint(0, len(chunks)), "")
+        assert list(iter_words(chunks)) == list(analyze_text(text).words)
+
+
+def test_approximate_top_k_words_is_exact_with_enough_capacity():
+    generator = random.Random(27)
+    for _ in range(20):
+        text = " ".join(_random_words(generator))
+        k = generator.randint(1, 15)
+
+        approximate = approximate_top_k_words(
+            _random_chunks(generator, text), k, capacity=len(VOCABULARY)
+        )
+
+        assert approximate == top_k_words(analyze_text(text).word_counts, k)
+
+
+def test_word_index_reports_non_words_as_absent():
+    index = WordIndex(["a", "b", "a"])
+    assert index.count(value="a") == 2
+    for value in (0, None, b"a", ["a"]):
+        assert value not in index
+        assert index.count(value) == 0
+
+
+def test_cached_analysis_round_trips_through_disk_and_is_immutable(tmp_path):
+    text = "Шалаш, дом и шалаш.\nКазак ДОМ"
+    expected = analyze_text(text)
+    AnalysisCache(directory=tmp_path).get_or_analyze(text)
+
+    restored = AnalysisCache(directory=tmp_path).get(text)
+
+    assert restored == expected
+    assert list(restored.words) == list(expected.words)
+    assert restored.words.positions("дом").tolist() == [1, 5]
+    with pytest.raises(TypeError):
+        restored.word_counts["дом"] = 0
+    with pytest.raises(TypeError):
+        restored.words.append("дом")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"version": 1, "word_counts": [["шалаш", 1]]},
+        {"version": 1, "word_counts": 5},
+        # Номер слова вне словаря
+        {
+            "version": 1,
+            "word_counts": [["шалаш", 1]],
+            "longest_word": "шалаш",
+            "most_frequent_word": "шалаш",
+            "count_of_special_chars": 0,
+            "palindromes": ["шалаш"],
+            "token_ids": "BwAAAA==",
+        },
+    ],
+)
+def test_invalid_cache_entry_is_a_miss(tmp_path, data):
+    AnalysisCache(directory=tmp_path).put("шалаш", analyze_text("шалаш"))
+    [name] = os.listdir(tmp_path)
+    (tmp_path / name).write_text(json.dumps(data), encoding="utf-8")
+
+    cache = AnalysisCache(directory=tmp_path)
+    assert cache.get("шалаш") is None
+    assert not os.listdir(tmp_path)
+
+
+def test_cache_files_of_other_versions_are_removed(tmp_path):
+    AnalysisCache(directory=tmp_path).put("шалаш", analyze_text("шалаш"))
+    [name] = os.listdir(tmp_path)
+    old_name = "v0-" + name.partition("-")[2]
+    os.rename(tmp_path / name, tmp_path / old_name)
+    (tmp_path / "notes.txt").write_text("не запись кэша", encoding="utf-8")
+
+    cache = AnalysisCache(directory=tmp_path)
+
+    assert len(cache) == 0
+    assert cache.get("шалаш") is None
+    assert os.listdir(tmp_path) == ["notes.txt"]